@@ -0,0 +1,80 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+KEY_PREFIX = "response"
+
+
+def user_scope(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def trip_scope(trip_id) -> str:
+    return f"trip:{trip_id}"
+
+
+def invalidate(*scopes):
+    """
+    Drops every cached response of the scopes by giving them a new generation.
+    Old entries are never read again and expire on their own.
+    """
+    generation = time.time_ns()
+    cache.set_many({f"{KEY_PREFIX}:generation:{scope}": generation for scope in scopes}, None)
+
+
+def get_generations(scopes) -> list:
+    keys = [f"{KEY_PREFIX}:generation:{scope}" for scope in scopes]
+    generations = cache.get_many(keys)
+
+    missing = {key: time.time_ns() for key in keys if key not in generations}
+    for key, generation in missing.items():
+        # Another worker may have started the scope meanwhile; keep its generation.
+        if not cache.add(key, generation, None):
+            missing[key] = cache.get(key, generation)
+
+    return [generations.get(key, missing.get(key)) for key in keys]
+
+
+class CachedResponseMixin:
+    """
+    Caches ``list`` and ``retrieve`` responses per user for RESPONSE_CACHE_TTL seconds.
+    Keys include the generation of every scope from ``get_cache_scopes``, so writes
+    that ``invalidate`` a scope (see the model signals) make its responses miss.
+    Data that the responses depend on but no signal tracks (such as exchange rates)
+    goes into the key through ``get_cache_versions``.
+    """
+
+    def get_cache_scopes(self) -> list:
+        return [user_scope(self.request.user.pk)]
+
+    def get_cache_versions(self) -> list:
+        return []
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        ttl = settings.RESPONSE_CACHE_TTL
+        if not ttl or not request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+
+        generations = ":".join(
+            str(generation) for generation in (*get_generations(self.get_cache_scopes()), *self.get_cache_versions())
+        )
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        key = f"{KEY_PREFIX}:{request.user.pk}:{generations}:{path}"
+
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, ttl)
+        return response
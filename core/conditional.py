@@ -0,0 +1,71 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+from rest_framework.status import HTTP_304_NOT_MODIFIED
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag and Last-Modified to ``list`` and ``retrieve`` responses and answers
+    matching If-None-Match / If-Modified-Since with 304 Not Modified.
+
+    Validators come from ``updated_at`` and row counts, one cheap query without
+    serializing anything. ``weak_etag`` marks responses whose derived fields
+    (such as converted budgets) may drift while the rows stay the same.
+
+    Lists get an ETag only: the newest ``updated_at`` does not move when a row is
+    deleted, so it cannot serve as their Last-Modified.
+    """
+    weak_etag = False
+
+    def get_list_validators(self, queryset):
+        """
+        Returns the values identifying the list's content
+        """
+        stats = queryset.aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+        return [stats['count'], stats['last_modified']]
+
+    def get_object_validators(self, obj):
+        return [obj.pk], obj.updated_at
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        parts = self.get_list_validators(queryset)
+        return self.conditional_response(super().list, parts, None, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        parts, last_modified = self.get_object_validators(self.get_object())
+        return self.conditional_response(super().retrieve, parts, last_modified, request, *args, **kwargs)
+
+    def get_object(self):
+        # retrieve() needs the object for its validators and again to serialize it
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+    def conditional_response(self, handler, parts, last_modified, request, *args, **kwargs):
+        digest = hashlib.md5(
+            ":".join(str(part) for part in (request.get_full_path(), *parts, last_modified)).encode()
+        ).hexdigest()
+        etag = f'W/"{digest}"' if self.weak_etag else f'"{digest}"'
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        conditional = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if conditional is not None and conditional.status_code != HTTP_304_NOT_MODIFIED:
+            return conditional
+        if conditional is not None:
+            response = Response(status=HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        # Clients may keep the response but must revalidate it before reuse
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,32 @@
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework.views import exception_handler as drf_exception_handler
+
+from integrations.services.circuit_breaker import CircuitOpenError
+from integrations.services.rate_limiter import QuotaExceededError
+
+
+class UpstreamUnavailable(APIException):
+    status_code = 503
+    default_detail = "An upstream service is temporarily unavailable."
+    default_code = "upstream_unavailable"
+
+    def __init__(self, detail=None, code=None, wait=None):
+        super().__init__(detail, code)
+        self.wait = wait
+
+
+def upstream_exception(error: CircuitOpenError) -> APIException:
+    """
+    Returns the API error for an upstream call refused with nothing cached to serve:
+    429 when the provider's request quota is used up, 503 while its circuit is open.
+    Both carry Retry-After.
+    """
+    if isinstance(error, QuotaExceededError):
+        return Throttled(wait=error.retry_after, detail="The upstream request quota is used up.")
+    return UpstreamUnavailable(wait=error.retry_after)
+
+
+def exception_handler(exc, context):
+    if isinstance(exc, CircuitOpenError):
+        exc = upstream_exception(exc)
+    return drf_exception_handler(exc, context)
@@ -0,0 +1,65 @@
+from rest_framework.permissions import SAFE_METHODS
+
+
+def get_field_selection(request):
+    """
+    Returns the field names from ``?fields=`` (None when absent) and from ``?omit=``
+    """
+    fields = request.query_params.get('fields')
+    omit = request.query_params.get('omit')
+
+    selected = {name.strip() for name in fields.split(',') if name.strip()} if fields else None
+    omitted = {name.strip() for name in omit.split(',') if name.strip()} if omit else set()
+    return selected, omitted
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Drops fields from read responses that are not listed in ``?fields=a,b``
+    or are listed in ``?omit=c``. Unknown names are ignored; writes keep every field.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+
+        selected, omitted = get_field_selection(request)
+        for name in list(self.fields):
+            if (selected is not None and name not in selected) or name in omitted:
+                self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """
+    Loads only the columns the sparse serializer still needs for list responses.
+
+    ``sparse_field_sources`` maps computed serializer fields to the model fields
+    they read; ``sparse_required_fields`` are always loaded (the primary key and
+    the pagination ordering, read from every row).
+    """
+    sparse_field_sources = {}
+    sparse_required_fields = ('id',)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list':
+            return queryset
+
+        selected, omitted = get_field_selection(self.request)
+        if selected is None and not omitted:
+            return queryset
+
+        columns = set(self.sparse_required_fields)
+        for name, field in self.get_serializer().fields.items():
+            columns.update(self.sparse_field_sources.get(name, (field.source,)))
+
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = {column for column in columns if column.split('__')[0] in model_fields}
+
+        if not any('__' in column for column in columns):
+            # No related field is read, so the join can go too
+            queryset = queryset.select_related(None)
+        return queryset.only(*columns)
@@ -0,0 +1,134 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination without OFFSET scans or COUNT(*), with a client page size capped by the server.
+
+    The cursor holds the values of every ``ordering`` field for the row it points at,
+    and a page continues from it with a row comparison such as
+    ``date > d OR (date = d AND id > i)``. DRF's own cursor only compares the first
+    field and skips rows that share it with an OFFSET, which gets slow and is capped at
+    ``offset_cutoff``. ``ordering`` must end with a unique field.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        reverse, current_position = (False, None) if self.cursor is None else self.cursor[1:]
+
+        ordering = self.reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(current_position, ordering, queryset.model))
+
+        # One extra row tells whether another page follows
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        following_position = (
+            self._get_position_from_instance(results[-1], self.ordering) if len(results) > len(self.page) else None
+        )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        # Positions are unique, so links never need an offset; ignore one from a crafted cursor
+        return cursor._replace(offset=0) if cursor is not None else None
+
+    def get_keyset_filter(self, position, ordering, model):
+        """
+        Returns the rows after ``position`` in ``ordering``, compared field by field
+        """
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = None
+        for field, value in reversed(list(zip(ordering, values))):
+            attr = field.lstrip('-')
+            value = self.get_position_value(model, attr, value)
+            after = Q(**{f"{attr}__{'lt' if field.startswith('-') else 'gt'}": value})
+            condition = after if condition is None else after | (Q(**{attr: value}) & condition)
+        return condition
+
+    def get_position_value(self, model, attr, value):
+        """
+        Converts a cursor value with its model field, so a crafted cursor gets a 404
+        rather than failing in the database
+        """
+        try:
+            value = model._meta.get_field(attr).to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        # Ordering fields are not nullable, and NULL never compares equal in SQL
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value
+
+    def reverse_ordering(self, ordering):
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    def _get_position_from_instance(self, instance, ordering):
+        return json.dumps([str(getattr(instance, field.lstrip('-'))) for field in ordering])
+
+
+class TripCursorPagination(KeysetPagination):
+    ordering = ('start_date', 'id')
+
+
+class TripPointCursorPagination(KeysetPagination):
+    ordering = ('date', 'id')
+
+
+class OptionalCursorPaginationMixin:
+    """
+    Lets clients opt into keyset pagination with ``?pagination=cursor``.
+    Requests that carry a ``cursor`` stay in that mode.
+    """
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.wants_cursor_pagination():
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+    def wants_cursor_pagination(self):
+        request = getattr(self, 'request', None)
+        if self.cursor_pagination_class is None or request is None:
+            return False
+        query_params = getattr(request, 'query_params', request.GET)
+        return query_params.get('pagination') == 'cursor' or 'cursor' in query_params
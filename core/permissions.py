@@ -4,8 +4,9 @@ from rest_framework import permissions
 class IsOwnerPermission(permissions.BasePermission):
     """Allows only owners of an object to watch and edit it."""
     def has_object_permission(self, request, view, obj):
-        if hasattr(obj, 'user'):
-            return obj.user == request.user
-        if hasattr(obj, 'trip'):
-            return obj.trip.user == request.user
+        # Compare ids so neither the owner nor the trip's owner is loaded
+        if hasattr(obj, 'user_id'):
+            return obj.user_id == request.user.pk
+        if hasattr(obj, 'trip_id'):
+            return obj.trip.user_id == request.user.pk
         return False
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""
+Gunicorn settings for serving the API in production; every value can be set from the environment.
+
+GUNICORN_WORKER_CLASS=gthread (default) serves wsgi.py with a pool of threads per worker.
+GUNICORN_WORKER_CLASS=uvicorn serves asgi.py with uvicorn workers; pair it with
+ASYNC_INTEGRATION_VIEWS=True so weather/ and places-nearby/ run on the event loop.
+"""
+import multiprocessing
+import os
+
+WORKER_CLASSES = {
+    "gthread": "gthread",
+    "sync": "sync",
+    "uvicorn": "uvicorn_worker.UvicornWorker",
+}
+
+_worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+wsgi_app = (
+    "travel_planner_api.asgi:application" if _worker_class == "uvicorn"
+    else "travel_planner_api.wsgi:application"
+)
+worker_class = WORKER_CLASSES.get(_worker_class, _worker_class)
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# Requests spend most of their time waiting on Postgres and upstream APIs
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# Recycle workers now and then so slow leaks cannot grow; jitter keeps them from restarting together
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+# Load the app before forking so workers share its memory pages
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from integrations.services import metrics
+from integrations.services.rate_limiter import TokenBucket
+
+
+class Command(BaseCommand):
+    help = "Shows cache hit/miss counters and remaining request quotas of external integrations."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reset counters after printing them.")
+
+    def handle(self, *args, **options):
+        for namespace in metrics.CACHED_INTEGRATIONS:
+            stats = metrics.get_cache_stats(namespace)
+            self.stdout.write(
+                f"{namespace}: hit={stats['hit']} stale={stats['stale']} "
+                f"miss={stats['miss']} hit_ratio={stats['hit_ratio']}"
+            )
+
+        for provider in settings.UPSTREAM_QUOTAS['PROVIDERS']:
+            self.stdout.write(f"{provider}: quota_remaining={TokenBucket(provider).remaining()}")
+
+        if options["reset"]:
+            metrics.reset(
+                f"{namespace}.{event}"
+                for namespace in metrics.CACHED_INTEGRATIONS
+                for event in metrics.CACHE_EVENTS
+            )
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from integrations.services import metrics, rate_limiter, singleflight
+from integrations.services.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+_local_cache = {}
+_local_lock = threading.Lock()
+_background_tasks = set()
+
+
+def geo_key(prefix: str, lat, lon, precision: int, *extra) -> str:
+    """
+    Builds a cache key for the grid cell containing the coordinates.
+    Two decimal places make cells of roughly 1 km.
+    """
+    parts = [prefix, f"{float(lat):.{precision}f}", f"{float(lon):.{precision}f}"]
+    parts.extend(str(value) for value in extra)
+    return ":".join(parts)
+
+
+def get_or_fetch(key: str, fetch, ttl: int, local: bool = False, stale_ttl: int = 0, stats: str = None):
+    """
+    Returns the value stored under ``key`` or calls ``fetch()`` and stores its result.
+
+    Values live in Django's cache so every worker shares them. With ``local=True``
+    they are also kept in process memory until the same expiry time, so hot keys
+    skip the shared cache round-trip too.
+
+    Concurrent misses of the same key share one ``fetch()`` call, within the process
+    and across workers (see ``singleflight``).
+
+    With ``stale_ttl`` an expired value is still served for that many seconds while
+    a background thread refreshes it (stale-while-revalidate). ``stats`` names the
+    namespace whose hit/stale/miss counters are incremented.
+
+    Values are kept CIRCUIT_BREAKER['FALLBACK_TTL'] seconds longer still: when the
+    upstream's circuit is open the raised ``CircuitOpenError`` carries the last value
+    as ``fallback``.
+    """
+    now = time.time()
+
+    if local:
+        entry = _local_cache.get(key)
+        if entry is not None and entry["expires_at"] > now:
+            _count(stats, "hit")
+            return entry["value"]
+
+    entry = cache.get(key)
+    if entry is not None and entry["expires_at"] > now:
+        _count(stats, "hit")
+    elif entry is not None and entry["expires_at"] + stale_ttl > now:
+        _count(stats, "stale")
+        _refresh_in_background(key, fetch, ttl, stale_ttl)
+    else:
+        _count(stats, "miss")
+        try:
+            entry = singleflight.do(
+                key,
+                fetch=lambda: _store(key, fetch(), ttl, stale_ttl),
+                ready=lambda: _fresh(cache.get(key)),
+            )
+        except CircuitOpenError as error:
+            _attach_fallback(error, entry)
+            raise
+
+    if local:
+        with _local_lock:
+            _local_cache[key] = entry
+
+    return entry["value"]
+
+
+async def aget_or_fetch(key: str, fetch, ttl: int, local: bool = False, stale_ttl: int = 0, stats: str = None):
+    """
+    Async counterpart of ``get_or_fetch`` where ``fetch`` is a coroutine function.
+    Stale values are refreshed in a task on the running event loop.
+    """
+    now = time.time()
+
+    if local:
+        entry = _local_cache.get(key)
+        if entry is not None and entry["expires_at"] > now:
+            await _acount(stats, "hit")
+            return entry["value"]
+
+    entry = await cache.aget(key)
+    if entry is not None and entry["expires_at"] > now:
+        await _acount(stats, "hit")
+    elif entry is not None and entry["expires_at"] + stale_ttl > now:
+        await _acount(stats, "stale")
+        await _arefresh_in_background(key, fetch, ttl, stale_ttl)
+    else:
+        await _acount(stats, "miss")
+        try:
+            entry = await singleflight.ado(
+                key,
+                fetch=lambda: _afetch_and_store(key, fetch, ttl, stale_ttl),
+                ready=lambda: _afresh(key),
+            )
+        except CircuitOpenError as error:
+            _attach_fallback(error, entry)
+            raise
+
+    if local:
+        with _local_lock:
+            _local_cache[key] = entry
+
+    return entry["value"]
+
+
+def refresh(key: str, fetch, ttl: int, stale_ttl: int = 0, unless_fresh_for: int = None):
+    """
+    Calls ``fetch()`` and stores its result under ``key`` whatever is cached now.
+    Used by the background refresher to renew values before their TTL runs out.
+
+    With ``unless_fresh_for`` a value that stays fresh at least that many more
+    seconds is left alone and None is returned.
+    """
+    if unless_fresh_for is not None:
+        entry = cache.get(key)
+        if entry is not None and entry["expires_at"] > time.time() + unless_fresh_for:
+            return None
+    return _store(key, fetch(), ttl, stale_ttl)["value"]
+
+
+def fetched_at(key: str):
+    """
+    Returns when the value under ``key`` was fetched (a timestamp), or None if nothing
+    is cached. Never fetches; responses derived from the value use it as their version.
+    """
+    entry = _local_cache.get(key)
+    if entry is None or entry["expires_at"] <= time.time():
+        entry = cache.get(key)
+    return entry.get("fetched_at") if entry is not None else None
+
+
+def clear_local_cache():
+    """
+    Drops every value kept in process memory
+    """
+    with _local_lock:
+        _local_cache.clear()
+
+
+def _store(key, value, ttl, stale_ttl):
+    now = time.time()
+    entry = {"value": value, "expires_at": now + ttl, "fetched_at": now}
+    cache.set(key, entry, ttl + stale_ttl + settings.CIRCUIT_BREAKER['FALLBACK_TTL'])
+    return entry
+
+
+def _attach_fallback(error, entry):
+    if entry is not None and error.fallback is None:
+        error.fallback = entry["value"]
+
+
+def _fresh(entry):
+    if entry is not None and entry["expires_at"] > time.time():
+        return entry
+    return None
+
+
+def _count(stats, event):
+    if stats:
+        metrics.incr(f"{stats}.{event}")
+
+
+def _refresh_in_background(key, fetch, ttl, stale_ttl):
+    # Only one worker refreshes a stale key; the rest keep serving the stale value.
+    if not cache.add(f"{key}:refreshing", True, ttl or 30):
+        return
+
+    def refresh():
+        try:
+            with rate_limiter.background():
+                _store(key, fetch(), ttl, stale_ttl)
+        except Exception:
+            logger.exception("Background refresh of %s failed", key)
+        finally:
+            cache.delete(f"{key}:refreshing")
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+async def _astore(key, value, ttl, stale_ttl):
+    now = time.time()
+    entry = {"value": value, "expires_at": now + ttl, "fetched_at": now}
+    await cache.aset(key, entry, ttl + stale_ttl + settings.CIRCUIT_BREAKER['FALLBACK_TTL'])
+    return entry
+
+
+async def _afetch_and_store(key, fetch, ttl, stale_ttl):
+    return await _astore(key, await fetch(), ttl, stale_ttl)
+
+
+async def _afresh(key):
+    return _fresh(await cache.aget(key))
+
+
+async def _acount(stats, event):
+    if stats:
+        await metrics.aincr(f"{stats}.{event}")
+
+
+async def _arefresh_in_background(key, fetch, ttl, stale_ttl):
+    if not await cache.aadd(f"{key}:refreshing", True, ttl or 30):
+        return
+
+    async def refresh():
+        try:
+            with rate_limiter.background():
+                await _astore(key, await fetch(), ttl, stale_ttl)
+        except Exception:
+            logger.exception("Background refresh of %s failed", key)
+        finally:
+            await cache.adelete(f"{key}:refreshing")
+
+    # Keep a reference so the task is not garbage-collected before it finishes.
+    task = asyncio.create_task(refresh())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
@@ -0,0 +1,138 @@
+import math
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = "integrations:circuit"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    Raised instead of calling an upstream whose circuit is open.
+    ``fallback`` holds the last cached value when the caller still has one and
+    ``retry_after`` the seconds until the upstream may be called again.
+    """
+
+    fallback = None
+    retry_after = None
+
+    def __init__(self, *args, retry_after=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker whose state lives in Django's cache, so every worker
+    stops calling a provider once it is seen failing.
+
+    closed: calls pass and consecutive failures are counted.
+    open: after FAILURE_THRESHOLD failures calls fail fast for RESET_TIMEOUT seconds.
+    half-open: then a single probe call is let through; its success closes the
+    circuit and its failure opens it again.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @classmethod
+    def for_url(cls, url: str) -> "CircuitBreaker":
+        return cls(urlsplit(url).netloc)
+
+    @property
+    def state(self) -> str:
+        return self._state(cache.get(self._key("opened_at")))
+
+    def raise_if_open(self):
+        """
+        Fails fast while the circuit is open, before the caller spends any upstream quota
+        """
+        opened_at = cache.get(self._key("opened_at"))
+        if self._state(opened_at) == OPEN:
+            raise self._open_error(opened_at)
+
+    def before_call(self):
+        opened_at = cache.get(self._key("opened_at"))
+        state = self._state(opened_at)
+        if state == OPEN or (state == HALF_OPEN and not cache.add(self._key("probe"), True, self._reset_timeout())):
+            raise self._open_error(opened_at)
+
+    def record_success(self):
+        cache.delete_many([self._key("failures"), self._key("opened_at"), self._key("probe")])
+
+    def record_failure(self):
+        if self.state == HALF_OPEN:
+            self._open()
+            return
+
+        cache.add(self._key("failures"), 0, None)
+        try:
+            failures = cache.incr(self._key("failures"))
+        except ValueError:
+            failures = 1
+            cache.set(self._key("failures"), failures, None)
+
+        if failures >= settings.CIRCUIT_BREAKER['FAILURE_THRESHOLD']:
+            self._open()
+
+    async def araise_if_open(self):
+        opened_at = await cache.aget(self._key("opened_at"))
+        if self._state(opened_at) == OPEN:
+            raise self._open_error(opened_at)
+
+    async def abefore_call(self):
+        opened_at = await cache.aget(self._key("opened_at"))
+        state = self._state(opened_at)
+        if state == OPEN or (state == HALF_OPEN and not await cache.aadd(self._key("probe"), True, self._reset_timeout())):
+            raise self._open_error(opened_at)
+
+    async def arecord_success(self):
+        await cache.adelete_many([self._key("failures"), self._key("opened_at"), self._key("probe")])
+
+    async def arecord_failure(self):
+        if self._state(await cache.aget(self._key("opened_at"))) == HALF_OPEN:
+            await self._aopen()
+            return
+
+        await cache.aadd(self._key("failures"), 0, None)
+        try:
+            failures = await cache.aincr(self._key("failures"))
+        except ValueError:
+            failures = 1
+            await cache.aset(self._key("failures"), failures, None)
+
+        if failures >= settings.CIRCUIT_BREAKER['FAILURE_THRESHOLD']:
+            await self._aopen()
+
+    def _state(self, opened_at) -> str:
+        if opened_at is None:
+            return CLOSED
+        if time.time() < opened_at + self._reset_timeout():
+            return OPEN
+        return HALF_OPEN
+
+    def _open_error(self, opened_at) -> CircuitOpenError:
+        # While a half-open probe is in flight its outcome is known within a second or so
+        retry_after = max(math.ceil(opened_at + self._reset_timeout() - time.time()), 1)
+        return CircuitOpenError(f"Circuit for {self.name} is open", retry_after=retry_after)
+
+    def _open(self):
+        cache.set(self._key("opened_at"), time.time(), None)
+        cache.delete_many([self._key("failures"), self._key("probe")])
+
+    async def _aopen(self):
+        await cache.aset(self._key("opened_at"), time.time(), None)
+        await cache.adelete_many([self._key("failures"), self._key("probe")])
+
+    def _reset_timeout(self) -> int:
+        return settings.CIRCUIT_BREAKER['RESET_TIMEOUT']
+
+    def _key(self, name: str) -> str:
+        return f"{KEY_PREFIX}:{self.name}:{name}"
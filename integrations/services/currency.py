@@ -1,15 +1,12 @@
-import requests
+from django.conf import settings
 
-COUNTRY_TO_CURRENCY = {
-    "Ukraine": "UAH",
-    "Poland": "PLN",
-    "Germany": "EUR",
-    "France": "EUR",
-    "United States": "USD",
-    "Italy": "EUR",
-    "Belgium": "EUR",
-    "United Kingdom": "GBP",
-}
+from integrations.services import http_client
+from integrations.services.cache import aget_or_fetch, fetched_at, get_or_fetch, refresh
+from integrations.services.circuit_breaker import CircuitOpenError
+from integrations.services.geo import CountryCurrencies
+
+# Accepts ISO codes, names and aliases of every country in integrations/data/countries.csv
+COUNTRY_TO_CURRENCY = CountryCurrencies()
 
 
 class CurrencyService:
@@ -25,23 +22,115 @@ class CurrencyService:
             raise ValueError("Currency for country '{country}' not found")
         return currency
 
-    def convert(self, amount: float, target_currency: str):
-        response = requests.get(f"{self.BASE_URL}/{self.base_currency}")
+    def get_rates(self) -> dict:
+        """
+        Returns rates from the base currency, computed from the single USD table
+        that is fetched at most once per TTL for every base currency
+        """
+        try:
+            usd_rates = get_or_fetch(
+                key=f"currency:rates:{self.BASE_CURRENCY}",
+                fetch=self._fetch_rates,
+                ttl=settings.CURRENCY_RATES_TTL,
+                local=True,
+                stats="currency",
+            )
+        except CircuitOpenError as error:
+            # Last known rates are better than no budget while the upstream is down.
+            if error.fallback is None:
+                raise
+            usd_rates = error.fallback
+        return self._cross_rates(usd_rates)
+
+    def refresh_rates(self, unless_fresh_for=None):
+        """
+        Fetches the USD table and stores it even if the cached one is still fresh,
+        unless it stays fresh ``unless_fresh_for`` more seconds (then returns None)
+        """
+        return refresh(
+            key=f"currency:rates:{self.BASE_CURRENCY}",
+            fetch=self._fetch_rates,
+            ttl=settings.CURRENCY_RATES_TTL,
+            unless_fresh_for=unless_fresh_for,
+        )
+
+    def rates_fetched_at(self):
+        """
+        Returns when the cached rate table was fetched, or None; changes with every refetch
+        """
+        return fetched_at(f"currency:rates:{self.BASE_CURRENCY}")
+
+    def _fetch_rates(self) -> dict:
+        response = http_client.get(f"{self.BASE_URL}/{self.BASE_CURRENCY}")
         response.raise_for_status()
         data = response.json()
 
-        rate = data["rates"].get(target_currency)
-        if rate is None:
-            raise ValueError("Invalid target currency")
+        return data["rates"]
 
-        return amount * rate
+    def convert(self, amount: float, target_currency: str):
+        return self._convert_with_rates(amount, target_currency, self.get_rates())
 
     def convert_budget_for_country(self, amount: float, country: str):
         target_currency = self.get_currency_by_country(country)
         converted = self.convert(amount, target_currency)
 
+        return self._format_budget(amount, converted, target_currency)
+
+    def _cross_rates(self, usd_rates: dict) -> dict:
+        if self.base_currency == self.BASE_CURRENCY:
+            return usd_rates
+
+        base_rate = usd_rates.get(self.base_currency)
+        if not base_rate:
+            raise ValueError(f"Unknown base currency '{self.base_currency}'")
+
+        return {currency: rate / base_rate for currency, rate in usd_rates.items()}
+
+    def _convert_with_rates(self, amount: float, target_currency: str, rates: dict):
+        rate = rates.get(target_currency)
+        if rate is None:
+            raise ValueError("Invalid target currency")
+
+        return amount * rate
+
+    def _format_budget(self, amount: float, converted: float, target_currency: str):
         return {
             "original_amount": amount,
             "original_currency": self.base_currency,
             "converted_amount": f"{round(converted, 2)} {target_currency}",
-        }
\ No newline at end of file
+        }
+
+
+class AsyncCurrencyService(CurrencyService):
+    """CurrencyService for async views; shares its rate-table cache."""
+
+    async def get_rates(self) -> dict:
+        try:
+            usd_rates = await aget_or_fetch(
+                key=f"currency:rates:{self.BASE_CURRENCY}",
+                fetch=self._fetch_rates,
+                ttl=settings.CURRENCY_RATES_TTL,
+                local=True,
+                stats="currency",
+            )
+        except CircuitOpenError as error:
+            if error.fallback is None:
+                raise
+            usd_rates = error.fallback
+        return self._cross_rates(usd_rates)
+
+    async def _fetch_rates(self) -> dict:
+        response = await http_client.aget(f"{self.BASE_URL}/{self.BASE_CURRENCY}")
+        response.raise_for_status()
+        data = response.json()
+
+        return data["rates"]
+
+    async def convert(self, amount: float, target_currency: str):
+        return self._convert_with_rates(amount, target_currency, await self.get_rates())
+
+    async def convert_budget_for_country(self, amount: float, country: str):
+        target_currency = self.get_currency_by_country(country)
+        converted = await self.convert(amount, target_currency)
+
+        return self._format_budget(amount, converted, target_currency)
\ No newline at end of file
@@ -0,0 +1,138 @@
+import bisect
+import csv
+import math
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+EARTH_RADIUS_KM = 6371.0
+# Length of one degree of latitude, the lower bound of any distance across it
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+class Country(NamedTuple):
+    code: str
+    code3: str
+    name: str
+    currency: str
+
+
+class City(NamedTuple):
+    name: str
+    country: Country
+    latitude: float
+    longitude: float
+    distance_km: float = 0.0
+
+
+def normalize(name: str) -> str:
+    return " ".join(str(name).split()).casefold()
+
+
+@lru_cache(maxsize=None)
+def _countries():
+    """
+    Loads the bundled country table on first use and indexes every country by its
+    normalized ISO codes, name and aliases
+    """
+    countries, index = [], {}
+
+    with open(DATA_DIR / "countries.csv", encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            country = Country(row["code"], row["code3"], row["name"], row["currency"])
+            countries.append(country)
+
+            aliases = [alias for alias in row["aliases"].split("|") if alias]
+            for key in (country.code, country.code3, country.name, *aliases):
+                index.setdefault(normalize(key), country)
+
+    return countries, index
+
+
+@lru_cache(maxsize=None)
+def _cities():
+    """
+    Loads the bundled city table on first use, sorted by latitude for ``nearest_city``
+    """
+    cities = []
+
+    with open(DATA_DIR / "cities.csv", encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            country = find_country(row["country"])
+            cities.append(City(row["name"], country, float(row["latitude"]), float(row["longitude"])))
+
+    cities.sort(key=lambda city: city.latitude)
+    return cities, [city.latitude for city in cities]
+
+
+def find_country(name: str):
+    """
+    Returns the country matching an ISO 3166 alpha-2/alpha-3 code, name or alias
+    regardless of case and spacing, or None
+    """
+    if not name:
+        return None
+    return _countries()[1].get(normalize(name))
+
+
+def distance_km(lat1, lon1, lat2, lon2) -> float:
+    """
+    Great-circle distance between two points
+    """
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def nearest_city(lat, lon, max_distance_km=None):
+    """
+    Returns the bundled city closest to the coordinates with its ``distance_km``,
+    or None when none lies within ``max_distance_km``.
+
+    Cities are scanned outwards from the query latitude and the scan stops once the
+    latitude gap alone is longer than the best distance found.
+    """
+    lat, lon = float(lat), float(lon)
+    cities, latitudes = _cities()
+    best, best_distance = None, math.inf if max_distance_km is None else max_distance_km
+
+    start = bisect.bisect_left(latitudes, lat)
+    below, above = start - 1, start
+    while below >= 0 or above < len(cities):
+        gap_below = (lat - latitudes[below]) * KM_PER_DEGREE if below >= 0 else math.inf
+        gap_above = (latitudes[above] - lat) * KM_PER_DEGREE if above < len(cities) else math.inf
+        if min(gap_below, gap_above) > best_distance:
+            break
+
+        if gap_below <= gap_above:
+            city, below = cities[below], below - 1
+        else:
+            city, above = cities[above], above + 1
+
+        distance = distance_km(lat, lon, city.latitude, city.longitude)
+        if distance <= best_distance:
+            best, best_distance = city, distance
+
+    return best._replace(distance_km=round(best_distance, 1)) if best else None
+
+
+class CountryCurrencies(Mapping):
+    """
+    Read-only country -> currency mapping over the bundled dataset. Lookups accept
+    any code, name or alias; iteration yields the canonical country names.
+    """
+
+    def __getitem__(self, name):
+        country = find_country(name)
+        if country is None:
+            raise KeyError(name)
+        return country.currency
+
+    def __iter__(self):
+        return (country.name for country in _countries()[0])
+
+    def __len__(self):
+        return len(_countries()[0])
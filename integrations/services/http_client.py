@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from integrations.services.circuit_breaker import CircuitBreaker
+from integrations.services.rate_limiter import TokenBucket
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+# httpx clients are bound to the event loop they were first used on.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _build_session() -> requests.Session:
+    config = settings.INTEGRATIONS_HTTP
+
+    # Retries happen in get() so that each attempt is charged to the upstream quota
+    adapter = HTTPAdapter(
+        pool_connections=config['POOL_CONNECTIONS'],
+        pool_maxsize=config['POOL_MAXSIZE'],
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide session whose keep-alive pools are shared by all services
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get(url: str, params=None, timeout=None) -> requests.Response:
+    """
+    Sends a GET through the shared session with the default connect/read timeouts,
+    retrying connection errors and 429/5xx answers with exponential backoff.
+
+    Fails fast with ``QuotaExceededError`` once the upstream host's request quota is
+    used up and with ``CircuitOpenError`` while its circuit is open. Every attempt
+    takes a quota token; retries stop early when none is left.
+    """
+    config = settings.INTEGRATIONS_HTTP
+    if timeout is None:
+        timeout = (config['CONNECT_TIMEOUT'], config['READ_TIMEOUT'])
+
+    bucket = TokenBucket.for_url(url)
+    breaker = CircuitBreaker.for_url(url)
+    # An open circuit fails fast without spending quota, and the token is taken before
+    # the half-open probe slot so a call refused for quota never holds that slot
+    breaker.raise_if_open()
+    bucket.acquire()
+    breaker.before_call()
+
+    response = error = None
+    for attempt in range(config['RETRIES'] + 1):
+        if attempt:
+            if not bucket.try_acquire():
+                break
+            time.sleep(config['BACKOFF_FACTOR'] * (2 ** (attempt - 1)))
+
+        try:
+            response, error = get_session().get(url, params=params, timeout=timeout), None
+        except requests.exceptions.RequestException as exc:
+            response, error = None, exc
+            continue
+
+        if response.status_code not in RETRY_STATUSES:
+            breaker.record_success()
+            return response
+        if response.status_code == 429:
+            bucket.drain()
+
+    breaker.record_failure()
+    if error is not None:
+        raise error
+    return response
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the keep-alive async client of the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+
+    if client is None:
+        config = settings.INTEGRATIONS_HTTP
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config['POOL_CONNECTIONS'] * config['POOL_MAXSIZE'],
+                max_keepalive_connections=config['POOL_MAXSIZE'],
+            ),
+            timeout=httpx.Timeout(config['READ_TIMEOUT'], connect=config['CONNECT_TIMEOUT']),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def aget(url: str, params=None, timeout=None) -> httpx.Response:
+    """
+    Async GET with the same timeouts, retry policy, quota and circuit breaker as ``get``
+    """
+    config = settings.INTEGRATIONS_HTTP
+    kwargs = {"params": params}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+
+    bucket = TokenBucket.for_url(url)
+    breaker = CircuitBreaker.for_url(url)
+    await breaker.araise_if_open()
+    await bucket.aacquire()
+    await breaker.abefore_call()
+
+    client = get_async_client()
+    response = error = None
+    for attempt in range(config['RETRIES'] + 1):
+        if attempt:
+            if not await bucket.atry_acquire():
+                break
+            await asyncio.sleep(config['BACKOFF_FACTOR'] * (2 ** (attempt - 1)))
+
+        try:
+            response, error = await client.get(url, **kwargs), None
+        except httpx.TransportError as exc:
+            response, error = None, exc
+            continue
+
+        if response.status_code not in RETRY_STATUSES:
+            await breaker.arecord_success()
+            return response
+        if response.status_code == 429:
+            await bucket.adrain()
+
+    await breaker.arecord_failure()
+    if error is not None:
+        raise error
+    return response
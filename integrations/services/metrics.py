@@ -0,0 +1,50 @@
+from django.core.cache import cache
+
+KEY_PREFIX = "integrations:metrics"
+CACHE_EVENTS = ("hit", "stale", "miss")
+CACHED_INTEGRATIONS = ("currency", "places", "weather")
+
+
+def incr(name: str, delta: int = 1):
+    """
+    Increments a counter shared by all workers through Django's cache,
+    in one round-trip once the counter exists
+    """
+    key = f"{KEY_PREFIX}:{name}"
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # First count; another worker may create the counter meanwhile
+        if not cache.add(key, delta, None):
+            cache.incr(key, delta)
+
+
+async def aincr(name: str, delta: int = 1):
+    key = f"{KEY_PREFIX}:{name}"
+    try:
+        await cache.aincr(key, delta)
+    except ValueError:
+        if not await cache.aadd(key, delta, None):
+            await cache.aincr(key, delta)
+
+
+def get_counters(names) -> dict:
+    keys = {f"{KEY_PREFIX}:{name}": name for name in names}
+    values = cache.get_many(keys.keys())
+    return {name: values.get(key, 0) for key, name in keys.items()}
+
+
+def get_cache_stats(namespace: str) -> dict:
+    """
+    Returns hit/stale/miss counters of a cached integration and its hit ratio
+    """
+    counters = get_counters(f"{namespace}.{event}" for event in CACHE_EVENTS)
+    stats = {event: counters[f"{namespace}.{event}"] for event in CACHE_EVENTS}
+
+    total = sum(stats.values())
+    stats["hit_ratio"] = round((stats["hit"] + stats["stale"]) / total, 3) if total else None
+    return stats
+
+
+def reset(names):
+    cache.delete_many([f"{KEY_PREFIX}:{name}" for name in names])
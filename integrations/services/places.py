@@ -1,4 +1,10 @@
+import httpx
 import requests
+from django.conf import settings
+
+from integrations.services import http_client
+from integrations.services.cache import aget_or_fetch, geo_key, get_or_fetch
+from integrations.services.circuit_breaker import CircuitOpenError
 
 class PlacesService:
     BASE_URL = "https://api.geoapify.com/v2/places"
@@ -7,6 +13,34 @@ class PlacesService:
         self.api_key = api_key
 
     def get_nearby_places(self,  lat, lon, radius=1000, categories=None):
+        """
+        Returns formatted places sorted by distance, cached per grid cell, radius and categories
+        """
+        config = settings.PLACES_CACHE
+
+        try:
+            return get_or_fetch(
+                key=geo_key("places", lat, lon, config['PRECISION'], radius, categories or ""),
+                fetch=lambda: self._fetch_places(lat, lon, radius, categories),
+                ttl=config['TTL'],
+                stats="places",
+            )
+
+        except CircuitOpenError as e:
+            if e.fallback is None:
+                raise
+            return e.fallback
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+
+    def _fetch_places(self, lat, lon, radius, categories):
+        response = http_client.get(self.BASE_URL, params=self._params(lat, lon, radius, categories))
+        response.raise_for_status()
+        data = response.json()
+
+        return self._format_places(data)
+
+    def _params(self, lat, lon, radius, categories):
         params = {
             "apiKey": self.api_key,
             "lat": lat,
@@ -17,15 +51,7 @@ class PlacesService:
         if categories:
             params["categories"] = categories
 
-        try:
-            response = requests.get(self.BASE_URL, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-
-            return self._format_places(data)
-
-        except requests.exceptions.RequestException as e:
-            return {"error": str(e)}
+        return params
 
     def _clean(self, dictionary: dict):
         """
@@ -60,6 +86,35 @@ class PlacesService:
 
             results.append(item)
 
-        results.sort(key=lambda x: x["відстань"] or 999999)
+        results.sort(key=lambda x: x.get("відстань") or 999999)
+
+        return results
+
+
+class AsyncPlacesService(PlacesService):
+    """PlacesService for async views; shares its cache and response format."""
+
+    async def get_nearby_places(self, lat, lon, radius=1000, categories=None):
+        config = settings.PLACES_CACHE
+
+        try:
+            return await aget_or_fetch(
+                key=geo_key("places", lat, lon, config['PRECISION'], radius, categories or ""),
+                fetch=lambda: self._fetch_places(lat, lon, radius, categories),
+                ttl=config['TTL'],
+                stats="places",
+            )
+
+        except CircuitOpenError as e:
+            if e.fallback is None:
+                raise
+            return e.fallback
+        except httpx.HTTPError as e:
+            return {"error": str(e)}
+
+    async def _fetch_places(self, lat, lon, radius, categories):
+        response = await http_client.aget(self.BASE_URL, params=self._params(lat, lon, radius, categories))
+        response.raise_for_status()
+        data = response.json()
 
-        return results
\ No newline at end of file
+        return self._format_places(data)
@@ -0,0 +1,160 @@
+import asyncio
+import contextvars
+import math
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+
+from integrations.services.circuit_breaker import CircuitOpenError
+
+KEY_PREFIX = "integrations:quota"
+
+_background = contextvars.ContextVar("integrations_background", default=False)
+
+
+class QuotaExceededError(CircuitOpenError):
+    """
+    Raised instead of calling an upstream whose request quota is used up.
+    Callers treat it like an open circuit and serve the ``fallback`` value if any.
+    """
+
+
+@contextmanager
+def background():
+    """
+    Marks upstream calls made inside the block as optional (refreshes of values that
+    are still served from the cache). They leave UPSTREAM_QUOTAS['RESERVE'] of every
+    bucket to requests that have nothing cached to fall back on.
+    """
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+class TokenBucket:
+    """
+    Token bucket of an upstream host stored in Django's cache, so the quota is shared
+    by all workers. It refills at RATE tokens per second up to BURST and every upstream
+    attempt, retries included, takes one token. Hosts missing from
+    UPSTREAM_QUOTAS['PROVIDERS'] are not limited.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.config = settings.UPSTREAM_QUOTAS['PROVIDERS'].get(name)
+
+    @classmethod
+    def for_url(cls, url: str) -> "TokenBucket":
+        return cls(urlsplit(url).netloc)
+
+    def acquire(self):
+        """
+        Takes a token or raises ``QuotaExceededError``
+        """
+        if not self.try_acquire():
+            raise self._exceeded(cache.get(self._key()))
+
+    def try_acquire(self) -> bool:
+        """
+        Takes a token if one is left and tells whether it did
+        """
+        if self.config is None:
+            return True
+
+        with self._locked():
+            tokens = self._refill(cache.get(self._key()))
+            allowed = tokens - 1 >= self._reserve()
+            self._save(tokens - 1 if allowed else tokens)
+        return allowed
+
+    async def aacquire(self):
+        if not await self.atry_acquire():
+            raise self._exceeded(await cache.aget(self._key()))
+
+    async def atry_acquire(self) -> bool:
+        if self.config is None:
+            return True
+
+        lock = await self._alock()
+        try:
+            tokens = self._refill(await cache.aget(self._key()))
+            allowed = tokens - 1 >= self._reserve()
+            await cache.aset(self._key(), self._state(tokens - 1 if allowed else tokens), None)
+        finally:
+            if lock:
+                await cache.adelete(self._key("lock"))
+        return allowed
+
+    def drain(self):
+        """
+        Empties the bucket after the provider answered 429 Too Many Requests
+        """
+        if self.config is not None:
+            self._save(0)
+
+    async def adrain(self):
+        if self.config is not None:
+            await cache.aset(self._key(), self._state(0), None)
+
+    def remaining(self):
+        """
+        Tokens available now, or None for hosts without a quota
+        """
+        if self.config is None:
+            return None
+        return int(self._refill(cache.get(self._key())))
+
+    def _refill(self, state) -> float:
+        if state is None:
+            return self.config['BURST']
+
+        elapsed = max(time.time() - state["updated_at"], 0)
+        return min(self.config['BURST'], state["tokens"] + elapsed * self.config['RATE'])
+
+    def _exceeded(self, state) -> QuotaExceededError:
+        missing = 1 + self._reserve() - self._refill(state)
+        retry_after = max(math.ceil(missing / self.config['RATE']), 1)
+        return QuotaExceededError(f"Request quota for {self.name} is used up", retry_after=retry_after)
+
+    def _reserve(self) -> float:
+        if _background.get():
+            return self.config['BURST'] * settings.UPSTREAM_QUOTAS['RESERVE']
+        return 0
+
+    def _save(self, tokens):
+        cache.set(self._key(), self._state(tokens), None)
+
+    def _state(self, tokens) -> dict:
+        return {"tokens": tokens, "updated_at": time.time()}
+
+    @contextmanager
+    def _locked(self):
+        # Serializes read-modify-write of the bucket; if the lock holder is slow the
+        # update goes ahead unlocked rather than stalling the request.
+        lock = False
+        for _ in range(10):
+            lock = cache.add(self._key("lock"), True, 1)
+            if lock:
+                break
+            time.sleep(0.005)
+        try:
+            yield
+        finally:
+            if lock:
+                cache.delete(self._key("lock"))
+
+    async def _alock(self) -> bool:
+        for _ in range(10):
+            if await cache.aadd(self._key("lock"), True, 1):
+                return True
+            await asyncio.sleep(0.005)
+        return False
+
+    def _key(self, suffix: str = None) -> str:
+        key = f"{KEY_PREFIX}:{self.name}"
+        return f"{key}:{suffix}" if suffix else key
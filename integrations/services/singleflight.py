@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache
+
+_calls = {}
+_calls_lock = threading.Lock()
+_async_calls = weakref.WeakKeyDictionary()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def do(key: str, fetch, ready):
+    """
+    Calls ``fetch()`` once for all concurrent callers of ``key``.
+
+    Threads of this process wait for the first caller and share its result or error.
+    Other workers wait on a cache lock and poll ``ready()`` until it returns the value
+    the lock holder stored; if the holder fails or hangs they fetch it themselves.
+    """
+    with _calls_lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = _Call()
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    try:
+        call.value = _locked(key, fetch, ready)
+    except Exception as error:
+        call.error = error
+        raise
+    finally:
+        with _calls_lock:
+            del _calls[key]
+        call.done.set()
+
+    return call.value
+
+
+async def ado(key: str, fetch, ready):
+    """
+    Async counterpart of ``do`` where ``fetch`` and ``ready`` are coroutine functions.
+    Callers on the same event loop await one shared task.
+    """
+    calls = _async_calls.setdefault(asyncio.get_running_loop(), {})
+    task = calls.get(key)
+    if task is None:
+        task = calls[key] = asyncio.ensure_future(_alocked(key, fetch, ready))
+        task.add_done_callback(lambda _: calls.pop(key, None))
+
+    # A cancelled caller must not cancel the fetch the others are waiting for.
+    return await asyncio.shield(task)
+
+
+def _locked(key, fetch, ready):
+    config = settings.INTEGRATIONS_SINGLE_FLIGHT
+    deadline = time.monotonic() + config['LOCK_TIMEOUT']
+
+    while True:
+        if cache.add(f"{key}:fetching", True, config['LOCK_TIMEOUT']):
+            try:
+                return fetch()
+            finally:
+                cache.delete(f"{key}:fetching")
+
+        time.sleep(config['POLL_INTERVAL'])
+        value = ready()
+        if value is not None:
+            return value
+        if time.monotonic() > deadline:
+            return fetch()
+
+
+async def _alocked(key, fetch, ready):
+    config = settings.INTEGRATIONS_SINGLE_FLIGHT
+    deadline = time.monotonic() + config['LOCK_TIMEOUT']
+
+    while True:
+        if await cache.aadd(f"{key}:fetching", True, config['LOCK_TIMEOUT']):
+            try:
+                return await fetch()
+            finally:
+                await cache.adelete(f"{key}:fetching")
+
+        await asyncio.sleep(config['POLL_INTERVAL'])
+        value = await ready()
+        if value is not None:
+            return value
+        if time.monotonic() > deadline:
+            return await fetch()
@@ -1,47 +1,144 @@
+import logging
+
+import httpx
 import requests
+from django.conf import settings
+
+from integrations.services import http_client
+from integrations.services.cache import aget_or_fetch, geo_key, get_or_fetch, refresh
+from integrations.services.circuit_breaker import CircuitOpenError
 from travel_planner_api.settings import WEATHER_API_KEY
 
+logger = logging.getLogger(__name__)
+
 
 class WeatherService:
     BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
 
     def get_weather(self, lat: str, lon: str, api_key=WEATHER_API_KEY) -> dict:
-        params = {
+        """
+        Returns current weather for the grid cell containing the coordinates.
+        Nearby points and repeat reads share one cached upstream response.
+        """
+        config = settings.WEATHER_CACHE
+        lat, lon, key = self._cell(lat, lon)
+
+        try:
+            return get_or_fetch(
+                key=key,
+                fetch=lambda: self._fetch_weather(lat, lon, api_key),
+                ttl=config['TTL'],
+                stale_ttl=config['STALE_TTL'],
+                stats="weather",
+            )
+
+        except CircuitOpenError as error:
+            return self._fallback(error)
+        except (requests.exceptions.RequestException, KeyError, IndexError, TypeError) as error:
+            return self._error(error)
+
+    def refresh_weather(self, lat, lon, api_key=WEATHER_API_KEY, unless_fresh_for=None):
+        """
+        Fetches weather for the grid cell and stores it even if the cached value is
+        still fresh, unless it stays fresh ``unless_fresh_for`` more seconds (then
+        returns None). Upstream errors propagate to the caller.
+        """
+        config = settings.WEATHER_CACHE
+        lat, lon, key = self._cell(lat, lon)
+
+        return refresh(
+            key=key,
+            fetch=lambda: self._fetch_weather(lat, lon, api_key),
+            ttl=config['TTL'],
+            stale_ttl=config['STALE_TTL'],
+            unless_fresh_for=unless_fresh_for,
+        )
+
+    def _fallback(self, error) -> dict:
+        """
+        Last cached weather of the cell, flagged as stale, while the upstream is down.
+        With nothing cached the error propagates so the view can answer 429/503.
+        """
+        if error.fallback is None:
+            raise error
+        return {**error.fallback, "stale": True}
+
+    def _error(self, error) -> dict:
+        """
+        Logs a failed weather lookup and returns the error body served instead
+        """
+        if isinstance(error, (requests.exceptions.HTTPError, httpx.HTTPStatusError)):
+            logger.warning("Weather request was rejected: %s", error)
+            return {"error": "API key error or invalid request."}
+        if isinstance(error, (requests.exceptions.RequestException, httpx.HTTPError)):
+            logger.warning("Weather service could not be reached: %s", error)
+            return {"error": "Could not connect to weather service."}
+        logger.warning("Weather response could not be parsed: %r", error)
+        return {"error": "Error parsing weather data."}
+
+    def _cell(self, lat, lon) -> tuple:
+        precision = settings.WEATHER_CACHE['PRECISION']
+        lat, lon = round(float(lat), precision), round(float(lon), precision)
+
+        return lat, lon, geo_key("weather", lat, lon, precision)
+
+    def _fetch_weather(self, lat: float, lon: float, api_key: str) -> dict:
+        response = http_client.get(self.BASE_URL, params=self._params(lat, lon, api_key))
+        response.raise_for_status()
+
+        return self._format_weather(response.json())
+
+    def _params(self, lat: float, lon: float, api_key: str) -> dict:
+        return {
             "lat": lat,
             "lon": lon,
             "appid": api_key,
             "units": "metric"
         }
 
+    def _format_weather(self, data: dict) -> dict:
+        main_data = data.get('main', {})
+        weather_desc_list = data.get('weather', [{}])
+        weather_desc = weather_desc_list[0] if weather_desc_list else {}
+        wind_data = data.get('wind', {})
+        sys_data = data.get('sys', {})
+
+        weather_data = {
+            "погода": weather_desc.get('main'),
+            "опис": weather_desc.get('description'),
+            "температура °C": main_data.get('temp'),
+            "відчувається як": main_data.get('feels_like'),
+            "швидкість вітру(м/c)": wind_data.get('speed'),
+            "код країни": sys_data.get('country'),
+            "місто": data.get('name'),
+        }
+
+        return weather_data
+
+
+class AsyncWeatherService(WeatherService):
+    """WeatherService for async views; shares its cache and response format."""
+
+    async def get_weather(self, lat: str, lon: str, api_key=WEATHER_API_KEY) -> dict:
+        config = settings.WEATHER_CACHE
+        lat, lon, key = self._cell(lat, lon)
+
         try:
-            response = requests.get(self.BASE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            main_data = data.get('main', {})
-            weather_desc_list = data.get('weather', [{}])
-            weather_desc = weather_desc_list[0] if weather_desc_list else {}
-            wind_data = data.get('wind', {})
-            sys_data = data.get('sys', {})
-
-            weather_data = {
-                "погода": weather_desc.get('main'),
-                "опис": weather_desc.get('description'),
-                "температура °C": main_data.get('temp'),
-                "відчувається як": main_data.get('feels_like'),
-                "швидкість вітру(м/c)": wind_data.get('speed'),
-                "код країни": sys_data.get('country'),
-                "місто": data.get('name'),
-            }
-
-            return weather_data
-
-        except requests.exceptions.HTTPError as http_err:
-            print(f"HTTP помилка: {http_err}")
-            return {"error": "API key error or invalid request."}
-        except requests.exceptions.RequestException as req_err:
-            print(f"Помилка запиту: {req_err}")
-            return {"error": "Could not connect to weather service."}
-        except (KeyError, IndexError, TypeError) as json_err:
-            print(f"Помилка парсингу JSON: {json_err}")
-            return {"error": "Error parsing weather data."}
\ No newline at end of file
+            return await aget_or_fetch(
+                key=key,
+                fetch=lambda: self._fetch_weather(lat, lon, api_key),
+                ttl=config['TTL'],
+                stale_ttl=config['STALE_TTL'],
+                stats="weather",
+            )
+
+        except CircuitOpenError as error:
+            return self._fallback(error)
+        except (httpx.HTTPError, KeyError, IndexError, TypeError) as error:
+            return self._error(error)
+
+    async def _fetch_weather(self, lat: float, lon: float, api_key: str) -> dict:
+        response = await http_client.aget(self.BASE_URL, params=self._params(lat, lon, api_key))
+        response.raise_for_status()
+
+        return self._format_weather(response.json())
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RoutePointsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'route_points'
+
+    def ready(self):
+        from route_points import signals  # noqa: F401
@@ -0,0 +1,104 @@
+import asyncio
+from abc import ABCMeta, abstractmethod
+
+import httpx
+from asgiref.sync import sync_to_async
+from rest_framework import permissions
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from rest_framework.status import HTTP_404_NOT_FOUND
+from rest_framework.views import APIView
+
+from core.permissions import IsOwnerPermission
+from integrations.services.circuit_breaker import CircuitOpenError
+from integrations.services.currency import AsyncCurrencyService
+from integrations.services.weather import AsyncWeatherService
+
+from .models import TripPoint
+from .places import aget_nearby_places
+from .serializers import TripPointSerializer
+
+
+class TripPointAsyncView(APIView, metaclass=ABCMeta):
+    """
+    Base for async endpoints of a single trip point.
+
+    Runs the same authentication, permission and throttle classes and exception
+    handler as the DRF views, off the event loop, then awaits ``get_point`` so a
+    worker can keep many slow upstream calls in flight under ASGI.
+    """
+    http_method_names = ['get']
+    permission_classes = [permissions.IsAuthenticated, IsOwnerPermission]
+
+    async def dispatch(self, request, *args, **kwargs):
+        # APIView.dispatch with an awaited handler; DRF's own dispatch is sync only
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() not in self.http_method_names:
+                self.http_method_not_allowed(request, *args, **kwargs)
+            response = await self.get(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        return self.finalize_response(request, response, *args, **kwargs)
+
+    async def get(self, request, trip_id, pk):
+        point = await sync_to_async(self.get_object)(trip_id, pk)
+        return await self.get_point(point)
+
+    def get_object(self, trip_id, pk):
+        point = get_object_or_404(TripPoint.objects.select_related('trip'), pk=pk, trip_id=trip_id)
+        self.check_object_permissions(self.request, point)
+        return point
+
+    @abstractmethod
+    async def get_point(self, point) -> Response:
+        """
+        Returns the response for the point the user is allowed to read
+        """
+
+
+class TripPointWeatherAsyncView(TripPointAsyncView):
+
+    async def get_point(self, point):
+        local_budget_task = self.get_local_budget(point)
+
+        if point.latitude and point.longitude:
+            weather, local_budget = await asyncio.gather(
+                AsyncWeatherService().get_weather(lat=str(point.latitude), lon=str(point.longitude)),
+                local_budget_task,
+            )
+        else:
+            weather, local_budget = None, await local_budget_task
+
+        data = TripPointSerializer(point, context={'local_budgets': {point.pk: local_budget}}).data
+
+        if weather is not None:
+            data['weather'] = weather
+
+            if 'error' in data['weather']:
+                return Response("Weather not found", status=HTTP_404_NOT_FOUND)
+
+        return Response(data)
+
+    async def get_local_budget(self, point):
+        try:
+            converted = await AsyncCurrencyService(base_currency=point.trip.base_currency).convert_budget_for_country(
+                amount=float(point.planned_budget),
+                country=point.country,
+            )
+            return converted['converted_amount']
+        except (httpx.HTTPError, CircuitOpenError, KeyError, ValueError):
+            return None
+
+
+class TripPointPlacesNearbyAsyncView(TripPointAsyncView):
+
+    async def get_point(self, point):
+        return Response(await aget_nearby_places(point))
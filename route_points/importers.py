@@ -0,0 +1,158 @@
+import csv
+import io
+import json
+import os
+
+from defusedxml import DefusedXmlException
+from defusedxml.ElementTree import ParseError, iterparse
+from django.conf import settings
+from django.db import transaction
+
+from core.caching import invalidate, trip_scope
+from route_points.models import TripPoint
+from route_points.serializers import TripPointSerializer
+
+IMPORT_FIELDS = ('city', 'country', 'date', 'planned_budget', 'latitude', 'longitude')
+GPX_POINT_TAGS = ('wpt', 'rtept', 'trkpt')
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self):
+        return {"created": self.created, "failed": self.failed, "errors": self.errors}
+
+
+def parse_csv(stream):
+    """
+    Yields (line number, row) for a binary CSV stream; exported trip CSVs are accepted as is
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    for row in reader:
+        yield reader.line_num, row
+
+
+def parse_ndjson(stream):
+    """
+    Yields (line number, row) for a binary NDJSON stream, skipping trip header lines
+    """
+    for line_number, line in enumerate(io.TextIOWrapper(stream, encoding='utf-8-sig'), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_number, ValueError(f"Invalid JSON: {exc}")
+            continue
+        if not isinstance(row, dict):
+            yield line_number, ValueError("Expected a JSON object.")
+        elif row.get('type') != 'trip':
+            yield line_number, row
+
+
+def parse_gpx(stream):
+    """
+    Yields (point number, row) for waypoints, route points and track points of a GPX stream.
+    Parsed with defusedxml, so entity expansion and external references are rejected.
+    """
+    point_number = 0
+    open_elements = []
+    try:
+        for event, element in iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                open_elements.append(element)
+                continue
+
+            open_elements.pop()
+            tag = element.tag.rsplit('}', 1)[-1]
+            if tag not in GPX_POINT_TAGS:
+                continue
+
+            point_number += 1
+            children = {child.tag.rsplit('}', 1)[-1]: (child.text or '').strip() for child in element}
+            row = {
+                'latitude': element.get('lat'),
+                'longitude': element.get('lon'),
+                'city': children.get('name') or children.get('desc'),
+                'date': children.get('time', '')[:10] or None,
+            }
+            # Detach parsed points from the tree so memory stays flat on large tracks
+            element.clear()
+            if open_elements:
+                open_elements[-1].remove(element)
+            yield point_number, row
+    except (ParseError, DefusedXmlException) as exc:
+        yield point_number + 1, ValueError(f"Invalid GPX: {exc}")
+
+
+PARSERS = {
+    'csv': parse_csv,
+    'ndjson': parse_ndjson,
+    'gpx': parse_gpx,
+}
+EXTENSIONS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.gpx': 'gpx',
+}
+
+
+def detect_format(filename, import_format=None):
+    if import_format:
+        return import_format if import_format in PARSERS else None
+    return EXTENSIONS.get(os.path.splitext(filename or '')[1].lower())
+
+
+def import_points(trip, stream, import_format, defaults=None, batch_size=None):
+    """
+    Validates rows from the stream against the trip and inserts them in fixed-size batches.
+    Invalid rows are reported in the result and do not stop the import.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    defaults = {key: value for key, value in (defaults or {}).items() if value not in (None, '')}
+    if import_format == 'gpx':
+        # GPX has no budget; points can be given one later
+        defaults.setdefault('planned_budget', '0')
+    context = {'trip': trip}
+
+    result = ImportResult()
+    batch = []
+    for line, row in PARSERS[import_format](stream):
+        if isinstance(row, Exception):
+            result.add_error(line, {"non_field_errors": [str(row)]})
+            continue
+
+        data = {**defaults, **{field: row[field] for field in IMPORT_FIELDS if row.get(field) not in (None, '')}}
+        serializer = TripPointSerializer(data=data, context=context)
+        if not serializer.is_valid():
+            result.add_error(line, serializer.errors)
+            continue
+
+        batch.append(TripPoint(trip=trip, **serializer.validated_data))
+        if len(batch) >= batch_size:
+            result.created += _insert(batch)
+            batch = []
+
+    if batch:
+        result.created += _insert(batch)
+    if result.created:
+        # bulk_create sends no post_save signals
+        invalidate(trip_scope(trip.pk))
+
+    return result
+
+
+def _insert(batch):
+    with transaction.atomic():
+        TripPoint.objects.bulk_create(batch)
+    return len(batch)
@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from integrations.services.cache import geo_key
+from integrations.services.circuit_breaker import CircuitOpenError
+from integrations.services.currency import CurrencyService
+from integrations.services.places import PlacesService
+from integrations.services.weather import WeatherService
+from route_points.models import TripPointPlaces
+from route_points.places import NEARBY_PLACES_CATEGORIES, NEARBY_PLACES_RADIUS
+from route_points.serializers import TripPointSerializer
+
+
+def build_itinerary(trip):
+    """
+    Returns every point of the trip with its local budget, weather and nearby sights.
+
+    Upstream calls run concurrently on a bounded thread pool and are made once per
+    distinct location, so a trip costs roughly one upstream round-trip.
+    """
+    points = list(trip.points.order_by('date', 'id'))
+    points_by_id = {point.pk: point for point in points}
+    prefetched_places = {
+        row.point_id: row.places
+        for row in TripPointPlaces.objects.filter(
+            point__in=points,
+            radius=NEARBY_PLACES_RADIUS,
+            categories=NEARBY_PLACES_CATEGORIES,
+        )
+        if (row.latitude, row.longitude) == (points_by_id[row.point_id].latitude, points_by_id[row.point_id].longitude)
+    }
+
+    weather_precision = settings.WEATHER_CACHE['PRECISION']
+    weather_service = WeatherService()
+    places_service = PlacesService(settings.PLACES_API_KEY)
+
+    with ThreadPoolExecutor(max_workers=settings.ITINERARY_MAX_WORKERS) as executor:
+        # Warms the rate table while weather and places are fetched
+        rates_future = executor.submit(CurrencyService(base_currency=trip.base_currency).get_rates)
+
+        weather_futures = {}
+        places_futures = {}
+        for point in points:
+            if not (point.latitude and point.longitude):
+                continue
+
+            cell = geo_key("weather", point.latitude, point.longitude, weather_precision)
+            if cell not in weather_futures:
+                weather_futures[cell] = executor.submit(
+                    weather_service.get_weather,
+                    lat=str(point.latitude),
+                    lon=str(point.longitude),
+                )
+
+            location = (point.latitude, point.longitude)
+            if point.pk not in prefetched_places and location not in places_futures:
+                places_futures[location] = executor.submit(
+                    places_service.get_nearby_places,
+                    lat=point.latitude,
+                    lon=point.longitude,
+                    radius=NEARBY_PLACES_RADIUS,
+                    categories=NEARBY_PLACES_CATEGORIES,
+                )
+
+        # Rate failures are handled by the serializer, which leaves local_budget empty
+        rates_future.exception()
+
+    points_data = TripPointSerializer(points, many=True).data
+
+    for point, point_data in zip(points, points_data):
+        point_data['weather'] = None
+        point_data['places_nearby'] = prefetched_places.get(point.pk)
+
+        if not (point.latitude and point.longitude):
+            continue
+
+        cell = geo_key("weather", point.latitude, point.longitude, weather_precision)
+        point_data['weather'] = _result(weather_futures[cell])
+
+        if point_data['places_nearby'] is None:
+            point_data['places_nearby'] = _result(places_futures[(point.latitude, point.longitude)])
+
+    return points_data
+
+
+def _result(future):
+    # One unavailable upstream should not fail the whole itinerary
+    try:
+        return future.result()
+    except CircuitOpenError as error:
+        return {"error": str(error)}
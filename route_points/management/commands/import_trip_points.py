@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from route_points.importers import detect_format, import_points
+from trips.models import Trip
+
+
+class Command(BaseCommand):
+    help = "Imports trip points from a CSV, NDJSON or GPX file in bulk batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("trip_id", type=int)
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "ndjson", "gpx"], help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, help="Rows per bulk insert (IMPORT_BATCH_SIZE by default).")
+        parser.add_argument("--country", help="Country for rows that have none (e.g. GPX points).")
+        parser.add_argument("--planned-budget", help="Planned budget for rows that have none.")
+
+    def handle(self, *args, **options):
+        try:
+            trip = Trip.objects.get(id=options["trip_id"])
+        except Trip.DoesNotExist:
+            raise CommandError(f"Trip {options['trip_id']} not found")
+
+        import_format = detect_format(options["path"], options["format"])
+        if import_format is None:
+            raise CommandError("Cannot detect the file format, pass --format")
+
+        with open(options["path"], "rb") as stream:
+            result = import_points(
+                trip,
+                stream,
+                import_format,
+                defaults={'country': options["country"], 'planned_budget': options["planned_budget"]},
+                batch_size=options["batch_size"],
+            )
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {result.created} points, {result.failed} rows failed."))
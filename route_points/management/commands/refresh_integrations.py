@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from route_points.refresher import refresh_integrations
+
+
+class Command(BaseCommand):
+    help = "Renews cached currency rates and the weather of upcoming trip points before their TTL runs out."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Look-ahead for points (REFRESH_UPCOMING_DAYS by default).")
+        parser.add_argument("--places", action="store_true", help="Also prefetch nearby places of points that have none.")
+        parser.add_argument("--loop", action="store_true", help="Keep refreshing every --interval seconds.")
+        parser.add_argument("--interval", type=int, help="Seconds between runs (REFRESH_INTERVAL by default).")
+
+    def handle(self, *args, **options):
+        interval = options["interval"] or settings.REFRESH_INTERVAL
+
+        while True:
+            self.refresh(options, interval)
+            if not options["loop"]:
+                break
+            time.sleep(interval)
+
+    def refresh(self, options, interval):
+        result = refresh_integrations(days=options["days"], places=options["places"], interval=interval)
+
+        if result.missing_currencies:
+            self.stderr.write(f"No rates for: {', '.join(result.missing_currencies)}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed rates={result.rates} weather={result.weather} "
+            f"places={result.places}, {result.fresh} still fresh, {result.failed} failed."
+        ))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 01:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('route_points', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TripPointPlaces',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('radius', models.PositiveIntegerField()),
+                ('categories', models.CharField(blank=True, max_length=255)),
+                ('places', models.JSONField(default=list)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+                ('point', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='nearby_places', to='route_points.trippoint')),
+            ],
+        ),
+    ]
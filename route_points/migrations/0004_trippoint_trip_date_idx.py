@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('route_points', '0003_trippointplaces'),
+        ('trips', '0003_trip_user_start_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trippoint',
+            index=models.Index(fields=['trip', 'date'], name='trippoint_trip_date_idx'),
+        ),
+    ]
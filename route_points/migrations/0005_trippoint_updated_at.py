@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 01:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('route_points', '0004_trippoint_trip_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trippoint',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
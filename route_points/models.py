@@ -11,7 +11,27 @@ class TripPoint(models.Model):
     latitude = models.FloatField(default=0)
     longitude = models.FloatField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Points are listed per trip in date order
+            models.Index(fields=['trip', 'date'], name='trippoint_trip_date_idx'),
+        ]
 
     def __str__(self):
-        return f'{self.trip} | {self.city} | {self.country}'
\ No newline at end of file
+        return f'{self.trip} | {self.city} | {self.country}'
+
+
+class TripPointPlaces(models.Model):
+    """Nearby places prefetched for a trip point at the coordinates it had at that time."""
+    point = models.OneToOneField(TripPoint, related_name='nearby_places', on_delete=models.CASCADE)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    radius = models.PositiveIntegerField()
+    categories = models.CharField(max_length=255, blank=True)
+    places = models.JSONField(default=list)
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.point} | {len(self.places)} places'
@@ -0,0 +1,117 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from integrations.services import rate_limiter
+from integrations.services.circuit_breaker import CircuitOpenError
+from integrations.services.places import AsyncPlacesService, PlacesService
+from route_points.models import TripPoint, TripPointPlaces
+
+logger = logging.getLogger(__name__)
+
+NEARBY_PLACES_RADIUS = 10
+NEARBY_PLACES_CATEGORIES = "tourism.sights"
+
+_prefetch_executor = ThreadPoolExecutor(
+    max_workers=settings.PLACES_PREFETCH_WORKERS, thread_name_prefix="places-prefetch"
+)
+
+
+def get_nearby_places(point):
+    """
+    Returns sights near the point, preferring the prefetched table over the places API
+    """
+    prefetched = TripPointPlaces.objects.filter(
+        point=point,
+        latitude=point.latitude,
+        longitude=point.longitude,
+        radius=NEARBY_PLACES_RADIUS,
+        categories=NEARBY_PLACES_CATEGORIES,
+    ).values_list('places', flat=True).first()
+
+    if prefetched is not None:
+        return prefetched
+
+    return PlacesService(settings.PLACES_API_KEY).get_nearby_places(
+        lat=point.latitude,
+        lon=point.longitude,
+        radius=NEARBY_PLACES_RADIUS,
+        categories=NEARBY_PLACES_CATEGORIES,
+    )
+
+
+async def aget_nearby_places(point):
+    """
+    Async counterpart of ``get_nearby_places`` for async views
+    """
+    prefetched = await TripPointPlaces.objects.filter(
+        point=point,
+        latitude=point.latitude,
+        longitude=point.longitude,
+        radius=NEARBY_PLACES_RADIUS,
+        categories=NEARBY_PLACES_CATEGORIES,
+    ).values_list('places', flat=True).afirst()
+
+    if prefetched is not None:
+        return prefetched
+
+    return await AsyncPlacesService(settings.PLACES_API_KEY).get_nearby_places(
+        lat=point.latitude,
+        lon=point.longitude,
+        radius=NEARBY_PLACES_RADIUS,
+        categories=NEARBY_PLACES_CATEGORIES,
+    )
+
+
+def prefetch_nearby_places(point):
+    """
+    Fetches sights near the point and stores them for later reads
+    """
+    try:
+        places = PlacesService(settings.PLACES_API_KEY).get_nearby_places(
+            lat=point.latitude,
+            lon=point.longitude,
+            radius=NEARBY_PLACES_RADIUS,
+            categories=NEARBY_PLACES_CATEGORIES,
+        )
+    except CircuitOpenError:
+        return None
+    if not isinstance(places, list):
+        return None
+
+    prefetched, _ = TripPointPlaces.objects.update_or_create(
+        point=point,
+        defaults={
+            'latitude': point.latitude,
+            'longitude': point.longitude,
+            'radius': NEARBY_PLACES_RADIUS,
+            'categories': NEARBY_PLACES_CATEGORIES,
+            'places': places,
+        },
+    )
+    return prefetched
+
+
+def schedule_prefetch_nearby_places(point):
+    """
+    Prefetches the point's nearby places on a background thread once the current
+    transaction commits, so saving a point never waits on the places API
+    """
+    point_id = point.pk
+    transaction.on_commit(lambda: _prefetch_executor.submit(_prefetch_in_background, point_id))
+
+
+def _prefetch_in_background(point_id):
+    # Worker threads keep their own connections; drop them like a request would
+    close_old_connections()
+    try:
+        point = TripPoint.objects.filter(pk=point_id).first()
+        if point is not None and point.latitude and point.longitude:
+            with rate_limiter.background():
+                prefetch_nearby_places(point)
+    except Exception:
+        logger.exception("Prefetching nearby places of point %s failed", point_id)
+    finally:
+        close_old_connections()
@@ -0,0 +1,93 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+
+from integrations.services import rate_limiter
+from integrations.services.currency import COUNTRY_TO_CURRENCY, CurrencyService
+from integrations.services.weather import WeatherService
+from route_points.models import TripPoint
+from route_points.places import prefetch_nearby_places
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RefreshResult:
+    rates: int = 0
+    weather: int = 0
+    places: int = 0
+    fresh: int = 0
+    failed: int = 0
+    missing_currencies: list = field(default_factory=list)
+
+
+def upcoming_points(days=None):
+    """
+    Points with coordinates dated from today up to ``days`` days ahead
+    """
+    days = settings.REFRESH_UPCOMING_DAYS if days is None else days
+    today = timezone.localdate()
+
+    return (
+        TripPoint.objects
+        .filter(date__range=(today, today + timedelta(days=days)))
+        .exclude(latitude=0)
+        .exclude(longitude=0)
+    )
+
+
+def refresh_integrations(days=None, places=False, interval=None) -> RefreshResult:
+    """
+    Renews cached rates and the weather of upcoming points before their TTL runs out,
+    so requests keep hitting the cache. Values still fresh at the next run, ``interval``
+    seconds (REFRESH_INTERVAL) from now, are skipped. Each weather grid cell is fetched
+    once and the calls leave the quota reserve of every provider to user requests.
+    With ``places=True`` nearby places are also stored for points that have none.
+    """
+    interval = settings.REFRESH_INTERVAL if interval is None else interval
+    with rate_limiter.background():
+        return _refresh(upcoming_points(days), places, interval)
+
+
+def _refresh(points, places, interval) -> RefreshResult:
+    result = RefreshResult()
+
+    try:
+        rates = CurrencyService().refresh_rates(unless_fresh_for=interval)
+        if rates is None:
+            result.fresh += 1
+        else:
+            result.rates = 1
+            result.missing_currencies = sorted(set(COUNTRY_TO_CURRENCY.values()) - set(rates))
+    except (requests.exceptions.RequestException, KeyError, ValueError):
+        logger.exception("Refreshing currency rates failed")
+        result.failed += 1
+
+    weather_service = WeatherService()
+    precision = settings.WEATHER_CACHE['PRECISION']
+    cells = {
+        (round(float(lat), precision), round(float(lon), precision))
+        for lat, lon in points.values_list('latitude', 'longitude').iterator()
+    }
+    for lat, lon in cells:
+        try:
+            if weather_service.refresh_weather(lat, lon, unless_fresh_for=interval) is None:
+                result.fresh += 1
+            else:
+                result.weather += 1
+        except (requests.exceptions.RequestException, KeyError, IndexError, TypeError):
+            logger.exception("Refreshing weather for %s,%s failed", lat, lon)
+            result.failed += 1
+
+    if places:
+        for point in points.filter(nearby_places__isnull=True).iterator():
+            if prefetch_nearby_places(point) is None:
+                result.failed += 1
+            else:
+                result.places += 1
+
+    return result
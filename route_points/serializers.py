@@ -1,14 +1,64 @@
+from collections import defaultdict
+
+import requests
+from django.conf import settings
 from rest_framework import serializers
 
-from integrations.services.currency import CurrencyService
+from core.caching import invalidate, trip_scope
+from core.fieldsets import SparseFieldsetSerializerMixin
+from integrations.services.currency import COUNTRY_TO_CURRENCY, CurrencyService
+from integrations.services.geo import find_country, nearest_city
 from .models import TripPoint
 
 
-class TripPointSerializer(serializers.ModelSerializer):
+class TripPointListSerializer(serializers.ListSerializer):
+    """Computes local budgets for the whole page before serializing its points."""
+
+    def create(self, validated_data):
+        points = TripPoint.objects.bulk_create([TripPoint(**attrs) for attrs in validated_data])
+        # bulk_create sends no post_save signals
+        invalidate(*{trip_scope(point.trip_id) for point in points})
+        return points
+
+    def to_representation(self, data):
+        points = list(data.all() if hasattr(data, 'all') else data)
+        # ?omit=local_budget skips the rate lookups altogether
+        self.local_budgets = self.get_local_budgets(points) if 'local_budget' in self.child.fields else {}
+        return super().to_representation(points)
+
+    def get_local_budgets(self, points):
+        points_by_currency = defaultdict(list)
+        for point in points:
+            currency = COUNTRY_TO_CURRENCY.get(point.country)
+            if currency is not None:
+                points_by_currency[(point.trip.base_currency, currency)].append(point)
+
+        local_budgets = {}
+        rates_by_base = {}
+        for (base_currency, currency), currency_points in points_by_currency.items():
+            if base_currency not in rates_by_base:
+                try:
+                    # Every base currency is derived from the same cached table
+                    rates_by_base[base_currency] = CurrencyService(base_currency=base_currency).get_rates()
+                except (requests.exceptions.RequestException, KeyError, ValueError):
+                    rates_by_base[base_currency] = {}
+
+            rate = rates_by_base[base_currency].get(currency)
+            if rate is None:
+                continue
+            for point in currency_points:
+                converted = float(point.planned_budget) * rate
+                local_budgets[point.pk] = f"{round(converted, 2)} {currency}"
+
+        return local_budgets
+
+
+class TripPointSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     local_budget = serializers.SerializerMethodField()
 
     class Meta:
         model = TripPoint
+        list_serializer_class = TripPointListSerializer
         fields = [
             'id',
             'city',
@@ -22,16 +72,26 @@ class TripPointSerializer(serializers.ModelSerializer):
             'trip',
         ]
         read_only_fields = ['trip', 'local_budget']
+        # Filled from the coordinates when left out (see complete_location)
+        extra_kwargs = {
+            'city': {'required': False},
+            'country': {'required': False},
+        }
 
     def get_local_budget(self, obj):
+        if isinstance(self.parent, TripPointListSerializer):
+            return self.parent.local_budgets.get(obj.pk)
+        if 'local_budgets' in self.context:
+            return self.context['local_budgets'].get(obj.pk)
+
         try:
-            service = CurrencyService(base_currency="USD")
+            service = CurrencyService(base_currency=obj.trip.base_currency)
             converted = service.convert_budget_for_country(
                 amount=float(obj.planned_budget),
                 country=obj.country
             )
             return converted['converted_amount']
-        except Exception:
+        except (requests.exceptions.RequestException, KeyError, ValueError):
             return None
 
     def validate(self, attrs):
@@ -53,4 +113,28 @@ class TripPointSerializer(serializers.ModelSerializer):
         if lon and not (-180 <= float(lon) <= 180):
             raise serializers.ValidationError("Longitude must be between -180 and 180")
 
-        return attrs
\ No newline at end of file
+        # Full writes (create and PUT) need a location; PATCH keeps the stored one
+        if not self.partial:
+            if lat and lon and not (attrs.get('city') and attrs.get('country')):
+                self.complete_location(attrs, lat, lon)
+
+            missing = {field: "This field is required." for field in ('city', 'country') if not attrs.get(field)}
+            if missing:
+                raise serializers.ValidationError(missing)
+
+        return attrs
+
+    def complete_location(self, attrs, lat, lon):
+        """
+        Fills a missing city or country from the nearest bundled city,
+        without calling a geocoding service
+        """
+        city = nearest_city(lat, lon, settings.GEOCODING_MAX_DISTANCE_KM)
+        if city is None:
+            return
+
+        country = find_country(attrs.get('country'))
+        if not attrs.get('country'):
+            attrs['country'] = city.country.name
+        if not attrs.get('city') and country in (None, city.country):
+            attrs['city'] = city.name
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.caching import invalidate, trip_scope
+from route_points.models import TripPoint
+
+
+@receiver([post_save, post_delete], sender=TripPoint)
+def invalidate_point_responses(sender, instance, **kwargs):
+    invalidate(trip_scope(instance.trip_id))
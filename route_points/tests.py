@@ -1,12 +1,38 @@
 from django.contrib.auth import get_user_model
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory, force_authenticate
 from rest_framework import status
+from rest_framework.throttling import UserRateThrottle
 from datetime import date, timedelta
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+import time
 from decimal import Decimal
-from unittest.mock import patch
-
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import requests
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+
+from integrations.services import http_client, metrics, rate_limiter
+from integrations.services.cache import aget_or_fetch, clear_local_cache, get_or_fetch
+from integrations.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from integrations.services.currency import CurrencyService
+from integrations.services.rate_limiter import QuotaExceededError, TokenBucket
+from integrations.services.weather import WeatherService
 from trips.models import Trip
-from route_points.models import TripPoint
+from route_points.async_views import TripPointAsyncView, TripPointPlacesNearbyAsyncView, TripPointWeatherAsyncView
+from route_points import importers
+from route_points.importers import parse_gpx
+from route_points.models import TripPoint, TripPointPlaces
 
 User = get_user_model()
 
@@ -74,6 +100,38 @@ class TripPointCRUDTestCase(APITestCase):
             self.assertEqual(response.data[0]['city'], 'Kyiv')
             self.assertIn('local_budget', response.data[0])
 
+    def test_trip_points_list_ordered_by_date(self):
+        """Test: points are listed by visit date"""
+        TripPoint.objects.create(
+            trip=self.trip,
+            city="Odesa",
+            country="Ukraine",
+            date=date.today(),
+            planned_budget=Decimal("100.00"),
+        )
+
+        response = self.client.get(f'/api/trips/{self.trip.id}/points/')
+
+        cities = [point['city'] for point in response.data['results']]
+        self.assertEqual(cities, ['Odesa', 'Kyiv'])
+
+    def test_trip_points_cursor_pagination(self):
+        """Test: points can be paged with a cursor"""
+        TripPoint.objects.create(
+            trip=self.trip,
+            city="Odesa",
+            country="Ukraine",
+            date=date.today(),
+            planned_budget=Decimal("100.00"),
+        )
+
+        response = self.client.get(f'/api/trips/{self.trip.id}/points/?pagination=cursor&page_size=1')
+        self.assertEqual(response.data['results'][0]['city'], 'Odesa')
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'][0]['city'], 'Kyiv')
+        self.assertIsNone(response.data['next'])
+
     def test_create_trip_point(self):
         """Test: creating a new trip point"""
         url = f'/api/trips/{self.trip.id}/points/'
@@ -123,6 +181,17 @@ class TripPointCRUDTestCase(APITestCase):
         self.assertEqual(self.trip_point.city, 'Kyiv Updated')
         self.assertEqual(float(self.trip_point.planned_budget), 200.00)
 
+    def test_full_update_without_location_is_rejected(self):
+        """Test: a PUT without city and country is rejected instead of keeping the old values"""
+        url = f'/api/trips/{self.trip.id}/points/{self.trip_point.id}/'
+        data = {'date': self.trip_point.date, 'planned_budget': '200.00'}
+
+        response = self.client.put(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('city', response.data)
+        self.assertIn('country', response.data)
+
     def test_partial_update_trip_point(self):
         """Test: partially updating a trip point"""
         url = f'/api/trips/{self.trip.id}/points/{self.trip_point.id}/'
@@ -205,12 +274,11 @@ class TripPointCRUDTestCase(APITestCase):
                 [status.HTTP_404_NOT_FOUND, status.HTTP_403_FORBIDDEN]
             )
 
-    @patch('integrations.services.currency.CurrencyService.convert_budget_for_country')
+    @patch('integrations.services.currency.CurrencyService.get_rates')
     def test_local_budget_calculation_with_mock(self, mock_convert):
         """Test: calculating local_budget using mock"""
         mock_convert.return_value = {
-            'converted_amount': 4000.00,
-            'currency': 'UAH'
+            'UAH': 40.00,
         }
 
         url = f'/api/trips/{self.trip.id}/points/'
@@ -227,6 +295,53 @@ class TripPointCRUDTestCase(APITestCase):
         self.assertIsNotNone(local_budget)
         mock_convert.assert_called()
 
+    @patch('integrations.services.currency.CurrencyService.get_rates', return_value={'UAH': 40.0})
+    def test_create_point_completes_location_from_coordinates(self, mock_rates):
+        """Test: a point without city and country gets them from the nearest known city"""
+        url = f'/api/trips/{self.trip.id}/points/'
+        data = {
+            'date': str(date.today() + timedelta(days=2)),
+            'planned_budget': '50.00',
+            'latitude': 49.8419,
+            'longitude': 24.0315,
+        }
+
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['city'], 'Lviv')
+        self.assertEqual(response.data['country'], 'Ukraine')
+
+    def test_create_point_without_location_is_rejected(self):
+        """Test: city and country are required when no coordinates are given"""
+        url = f'/api/trips/{self.trip.id}/points/'
+        data = {'date': str(date.today() + timedelta(days=2)), 'planned_budget': '50.00'}
+
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('city', response.data)
+        self.assertIn('country', response.data)
+
+    @patch('integrations.services.currency.CurrencyService.get_rates')
+    def test_local_budget_for_country_alias(self, mock_rates):
+        """Test: countries outside the old hardcoded map resolve by code, name or alias"""
+        mock_rates.return_value = {'JPY': 150.0, 'CZK': 20.0}
+        self.trip_point.country = 'japan'
+        self.trip_point.save()
+        TripPoint.objects.create(
+            trip=self.trip,
+            city="Prague",
+            country="Czech Republic",
+            date=date.today() + timedelta(days=2),
+            planned_budget=Decimal("10.00"),
+        )
+
+        response = self.client.get(f'/api/trips/{self.trip.id}/points/')
+        results = response.data['results'] if 'results' in response.data else response.data
+
+        self.assertEqual([point['local_budget'] for point in results], ['15000.0 JPY', '200.0 CZK'])
+
 
 class TripPointPlacesNearbyTestCase(APITestCase):
     """Tests for nearby places search"""
@@ -320,3 +435,1359 @@ class TripPointWeatherTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('weather', response.data)
         mock_weather.assert_called_once()
+
+
+class CurrencyRatesCacheTestCase(APITestCase):
+    """Tests for the shared currency rate-table cache"""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        for city, country in [("Kyiv", "Ukraine"), ("Warsaw", "Poland"), ("Paris", "France")]:
+            TripPoint.objects.create(
+                trip=self.trip,
+                city=city,
+                country=country,
+                date=date.today() + timedelta(days=1),
+                planned_budget=Decimal("100.00"),
+            )
+
+        self.client.force_authenticate(user=self.user)
+
+    @patch('integrations.services.currency.CurrencyService._fetch_rates')
+    def test_page_of_points_fetches_rates_once(self, mock_fetch):
+        """Test: a page of points costs one upstream fetch, repeat reads cost none"""
+        mock_fetch.return_value = {'UAH': 40.0, 'PLN': 4.0, 'EUR': 0.9}
+
+        url = f'/api/trips/{self.trip.id}/points/'
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_fetch.call_count, 1)
+
+        budgets = {point['city']: point['local_budget'] for point in response.data['results']}
+        self.assertEqual(budgets['Kyiv'], '4000.0 UAH')
+        self.assertEqual(budgets['Paris'], '90.0 EUR')
+
+    @patch('integrations.services.currency.CurrencyService._fetch_rates')
+    def test_rates_shared_through_django_cache(self, mock_fetch):
+        """Test: another worker (empty process memory) reuses the shared cache"""
+        mock_fetch.return_value = {'UAH': 40.0}
+        url = f'/api/trips/{self.trip.id}/points/'
+
+        self.client.get(url)
+        clear_local_cache()
+        self.client.get(url)
+
+        self.assertEqual(mock_fetch.call_count, 1)
+
+    @patch('integrations.services.currency.CurrencyService._fetch_rates')
+    def test_rates_refetched_after_ttl(self, mock_fetch):
+        """Test: rate table is fetched again once the TTL is over"""
+        mock_fetch.return_value = {'UAH': 40.0}
+        url = f'/api/trips/{self.trip.id}/points/'
+
+        with patch('integrations.services.cache.time') as mock_time:
+            mock_time.time.return_value = 1000
+            self.client.get(url)
+            mock_time.time.return_value = 1000 + settings.CURRENCY_RATES_TTL
+            self.client.get(url)
+
+        self.assertEqual(mock_fetch.call_count, 2)
+
+
+class TripPointLocalBudgetBatchTestCase(APITestCase):
+    """Tests for page-level local budget computation"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        for city, country in [("Kyiv", "Ukraine"), ("Lviv", "Ukraine"), ("Atlantis", "Atlantis")]:
+            TripPoint.objects.create(
+                trip=self.trip,
+                city=city,
+                country=country,
+                date=date.today() + timedelta(days=1),
+                planned_budget=Decimal("10.00"),
+            )
+
+        self.client.force_authenticate(user=self.user)
+
+    @patch('integrations.services.currency.CurrencyService.convert_budget_for_country')
+    @patch('integrations.services.currency.CurrencyService.get_rates')
+    def test_list_resolves_rates_once_for_page(self, mock_rates, mock_convert):
+        """Test: the list resolves rates once and skips per-point conversion"""
+        mock_rates.return_value = {'UAH': 40.0}
+
+        response = self.client.get(f'/api/trips/{self.trip.id}/points/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_rates.assert_called_once()
+        mock_convert.assert_not_called()
+
+        budgets = {point['city']: point['local_budget'] for point in response.data['results']}
+        self.assertEqual(budgets, {'Kyiv': '400.0 UAH', 'Lviv': '400.0 UAH', 'Atlantis': None})
+
+    @patch('integrations.services.currency.CurrencyService.get_rates')
+    def test_list_survives_rates_failure(self, mock_rates):
+        """Test: upstream failure leaves local_budget empty instead of failing the list"""
+        mock_rates.side_effect = requests.exceptions.ConnectionError()
+
+        response = self.client.get(f'/api/trips/{self.trip.id}/points/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(all(point['local_budget'] is None for point in response.data['results']))
+
+
+class TripBaseCurrencyTestCase(APITestCase):
+    """Tests for conversion from the trip's base currency"""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        self.trips = {}
+        for base_currency in ('EUR', 'GBP'):
+            trip = Trip.objects.create(
+                user=self.user,
+                title=f"{base_currency} Trip",
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=7),
+                base_currency=base_currency,
+            )
+            TripPoint.objects.create(
+                trip=trip,
+                city="Kyiv",
+                country="Ukraine",
+                date=date.today() + timedelta(days=1),
+                planned_budget=Decimal("90.00"),
+            )
+            self.trips[base_currency] = trip
+
+        self.client.force_authenticate(user=self.user)
+
+    @patch('integrations.services.currency.CurrencyService._fetch_rates')
+    def test_cross_rates_from_single_table(self, mock_fetch):
+        """Test: trips in different base currencies share one USD table"""
+        mock_fetch.return_value = {'USD': 1.0, 'EUR': 0.9, 'GBP': 0.75, 'UAH': 40.0}
+
+        eur = self.client.get(f'/api/trips/{self.trips["EUR"].id}/points/')
+        gbp = self.client.get(f'/api/trips/{self.trips["GBP"].id}/points/')
+
+        self.assertEqual(eur.data['results'][0]['local_budget'], '4000.0 UAH')
+        self.assertEqual(gbp.data['results'][0]['local_budget'], '4800.0 UAH')
+        mock_fetch.assert_called_once()
+
+    @patch('integrations.services.currency.CurrencyService._fetch_rates')
+    def test_detail_uses_trip_base_currency(self, mock_fetch):
+        """Test: a single point is converted from its trip's base currency"""
+        mock_fetch.return_value = {'USD': 1.0, 'EUR': 0.9, 'UAH': 40.0}
+        trip = self.trips['EUR']
+        point = trip.points.get()
+
+        response = self.client.get(f'/api/trips/{trip.id}/points/{point.id}/')
+
+        self.assertEqual(response.data['local_budget'], '4000.0 UAH')
+
+    @patch('integrations.services.http_client.get')
+    def test_rates_fetched_for_usd_only(self, mock_get):
+        """Test: the upstream table is always requested for USD"""
+        mock_get.return_value.json.return_value = {'rates': {'USD': 1.0, 'EUR': 0.9, 'UAH': 40.0}}
+
+        rates = CurrencyService(base_currency='EUR').get_rates()
+
+        mock_get.assert_called_once_with(f'{CurrencyService.BASE_URL}/USD')
+        self.assertAlmostEqual(rates['USD'], 1 / 0.9)
+
+    @patch('integrations.services.currency.CurrencyService._fetch_rates')
+    def test_unknown_base_currency(self, mock_fetch):
+        """Test: an unknown base currency leaves local_budget empty"""
+        mock_fetch.return_value = {'USD': 1.0, 'UAH': 40.0}
+        trip = self.trips['EUR']
+        trip.base_currency = 'XXX'
+        trip.save()
+
+        response = self.client.get(f'/api/trips/{trip.id}/points/')
+
+        self.assertIsNone(response.data['results'][0]['local_budget'])
+
+
+class IntegrationsHttpClientTestCase(APITestCase):
+    """Tests for the shared integrations HTTP client"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_session_is_shared_and_pooled(self):
+        """Test: one pooled session is reused and leaves retries to get()"""
+        session = http_client.get_session()
+        adapter = session.get_adapter('https://api.openweathermap.org')
+
+        self.assertIs(http_client.get_session(), session)
+        self.assertEqual(adapter._pool_maxsize, settings.INTEGRATIONS_HTTP['POOL_MAXSIZE'])
+        self.assertEqual(adapter.max_retries.total, 0)
+
+    @patch('integrations.services.http_client.get_session')
+    def test_retries_are_charged_to_quota(self, mock_session):
+        """Test: every retry takes a quota token and retries stop when none is left"""
+        mock_session.return_value.get.return_value = Mock(status_code=503)
+        quotas = {'RESERVE': 0, 'PROVIDERS': {'api.example.com': {'RATE': 0.001, 'BURST': 2}}}
+
+        with self.settings(
+            UPSTREAM_QUOTAS=quotas,
+            INTEGRATIONS_HTTP={**settings.INTEGRATIONS_HTTP, 'RETRIES': 3, 'BACKOFF_FACTOR': 0},
+        ):
+            response = http_client.get('https://api.example.com/data')
+            remaining = TokenBucket('api.example.com').remaining()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(mock_session.return_value.get.call_count, 2)
+        self.assertEqual(remaining, 0)
+
+    @patch('integrations.services.http_client.get_session')
+    def test_quota_error_does_not_hold_probe(self, mock_session):
+        """Test: a call refused for quota leaves the half-open probe to the next caller"""
+        mock_session.return_value.get.return_value = Mock(status_code=200)
+        quotas = {'RESERVE': 0, 'PROVIDERS': {'api.example.com': {'RATE': 0.001, 'BURST': 1}}}
+        url = 'https://api.example.com/data'
+        cache.set('integrations:circuit:api.example.com:opened_at', time.time() - settings.CIRCUIT_BREAKER['RESET_TIMEOUT'] - 1)
+
+        with self.settings(UPSTREAM_QUOTAS=quotas):
+            TokenBucket('api.example.com').acquire()
+            with self.assertRaises(QuotaExceededError) as raised:
+                http_client.get(url)
+            self.assertGreaterEqual(raised.exception.retry_after, 1)
+
+        self.assertIsNone(cache.get('integrations:circuit:api.example.com:probe'))
+        http_client.get(url)
+        self.assertEqual(CircuitBreaker('api.example.com').state, 'closed')
+
+    @patch('integrations.services.http_client.get_session')
+    def test_open_circuit_does_not_spend_quota(self, mock_session):
+        """Test: calls refused by an open circuit leave the quota to the calls after recovery"""
+        quotas = {'RESERVE': 0, 'PROVIDERS': {'api.example.com': {'RATE': 0.001, 'BURST': 2}}}
+        cache.set('integrations:circuit:api.example.com:opened_at', time.time())
+
+        with self.settings(UPSTREAM_QUOTAS=quotas):
+            for _ in range(3):
+                with self.assertRaises(CircuitOpenError):
+                    http_client.get('https://api.example.com/data')
+            with self.assertRaises(CircuitOpenError):
+                async_to_sync(http_client.aget)('https://api.example.com/data')
+            remaining = TokenBucket('api.example.com').remaining()
+
+        self.assertEqual(remaining, 2)
+        mock_session.return_value.get.assert_not_called()
+
+    @patch('integrations.services.http_client.get_session')
+    def test_services_use_default_timeouts(self, mock_session):
+        """Test: service calls go through the shared session with timeouts"""
+        mock_session.return_value.get.return_value.json.return_value = {'name': 'Kyiv'}
+
+        WeatherService().get_weather(lat='50.45', lon='30.52')
+
+        _, kwargs = mock_session.return_value.get.call_args
+        config = settings.INTEGRATIONS_HTTP
+        self.assertEqual(kwargs['timeout'], (config['CONNECT_TIMEOUT'], config['READ_TIMEOUT']))
+
+
+    @patch('integrations.services.http_client.get_session')
+    def test_weather_errors_are_logged(self, mock_session):
+        """Test: failed weather lookups are logged and answered with an error body"""
+        mock_session.return_value.get.side_effect = requests.exceptions.ConnectionError()
+
+        with self.assertLogs('integrations.services.weather', level='WARNING'):
+            weather = WeatherService().get_weather(lat='50.45', lon='30.52')
+
+        self.assertEqual(weather, {"error": "Could not connect to weather service."})
+
+
+class WeatherCacheTestCase(APITestCase):
+    """Tests for the geo-bucketed weather cache"""
+
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        self.point = TripPoint.objects.create(
+            trip=self.trip,
+            city="Kyiv",
+            country="Ukraine",
+            date=date.today() + timedelta(days=1),
+            planned_budget=Decimal("100.00"),
+            latitude=50.4501,
+            longitude=30.5234
+        )
+
+        self.nearby_point = TripPoint.objects.create(
+            trip=self.trip,
+            city="Kyiv Center",
+            country="Ukraine",
+            date=date.today() + timedelta(days=2),
+            planned_budget=Decimal("100.00"),
+            latitude=50.4512,
+            longitude=30.5239
+        )
+
+        self.client.force_authenticate(user=self.user)
+
+    @patch('integrations.services.weather.WeatherService._fetch_weather')
+    def test_nearby_points_share_grid_cell(self, mock_fetch):
+        """Test: points in the same grid cell hit the upstream once"""
+        mock_fetch.return_value = {'погода': 'Clear'}
+
+        for point in (self.point, self.nearby_point, self.point):
+            url = f'/api/trips/{self.trip.id}/points/{point.id}/weather/'
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['weather'], {'погода': 'Clear'})
+
+        mock_fetch.assert_called_once_with(50.45, 30.52, settings.WEATHER_API_KEY)
+        self.assertEqual(metrics.get_cache_stats('weather')['hit'], 2)
+        self.assertEqual(metrics.get_cache_stats('weather')['miss'], 1)
+
+    @patch('integrations.services.weather.WeatherService._fetch_weather')
+    def test_errors_are_not_cached(self, mock_fetch):
+        """Test: failed upstream calls are retried on the next request"""
+        mock_fetch.side_effect = requests.exceptions.ConnectionError()
+        url = f'/api/trips/{self.trip.id}/points/{self.point.id}/weather/'
+
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    @patch('integrations.services.cache._refresh_in_background')
+    @patch('integrations.services.weather.WeatherService._fetch_weather')
+    def test_stale_value_served_while_revalidating(self, mock_fetch, mock_refresh):
+        """Test: an expired entry is served while a refresh is scheduled"""
+        mock_fetch.return_value = {'погода': 'Clear'}
+        url = f'/api/trips/{self.trip.id}/points/{self.point.id}/weather/'
+
+        with patch('integrations.services.cache.time') as mock_time:
+            mock_time.time.return_value = 1000
+            self.client.get(url)
+            mock_time.time.return_value = 1000 + settings.WEATHER_CACHE['TTL'] + 1
+            response = self.client.get(url)
+
+        self.assertEqual(response.data['weather'], {'погода': 'Clear'})
+        mock_fetch.assert_called_once()
+        mock_refresh.assert_called_once()
+        self.assertEqual(metrics.get_cache_stats('weather')['stale'], 1)
+
+    def test_counter_increments_in_one_round_trip(self):
+        """Test: an existing counter is incremented without an extra add"""
+        metrics.incr('weather.hit')
+
+        with patch('integrations.services.metrics.cache.add') as mock_add:
+            metrics.incr('weather.hit')
+
+        mock_add.assert_not_called()
+        self.assertEqual(metrics.get_cache_stats('weather')['hit'], 2)
+
+
+class SingleFlightTestCase(APITestCase):
+    """Tests for coalescing concurrent cache misses"""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+
+    def test_concurrent_misses_share_one_fetch(self):
+        """Test: threads missing the same key wait for a single upstream call"""
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return {'погода': 'Clear'}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_fetch('weather:50.45:30.52', fetch, ttl=60)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'погода': 'Clear'}] * 5)
+
+    def test_waits_for_value_fetched_by_another_worker(self):
+        """Test: a key locked by another worker is read from the cache once stored"""
+        key = 'weather:50.45:30.52'
+        cache.add(f'{key}:fetching', True, 30)
+        threading.Timer(0.1, lambda: cache.set(key, {'value': 'other', 'expires_at': time.time() + 60})).start()
+
+        fetch = Mock()
+        self.assertEqual(get_or_fetch(key, fetch, ttl=60), 'other')
+        fetch.assert_not_called()
+
+    def test_async_misses_share_one_fetch(self):
+        """Test: coroutines missing the same key await a single upstream call"""
+        fetch = AsyncMock(return_value={'погода': 'Clear'})
+
+        async def fetch_all():
+            return await asyncio.gather(*(aget_or_fetch('weather:1.00:2.00', fetch, ttl=60) for _ in range(5)))
+
+        self.assertEqual(async_to_sync(fetch_all)(), [{'погода': 'Clear'}] * 5)
+        fetch.assert_awaited_once()
+
+class CircuitBreakerTestCase(APITestCase):
+    """Tests for the per-upstream circuit breaker"""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+
+    @patch('integrations.services.http_client.get_session')
+    def test_circuit_opens_and_probe_closes_it(self, mock_session):
+        """Test: repeated failures open the circuit and a successful probe closes it"""
+        mock_session.return_value.get.side_effect = requests.exceptions.ConnectionError()
+        url = 'https://api.example.com/data'
+
+        with self.settings(
+            CIRCUIT_BREAKER={**settings.CIRCUIT_BREAKER, 'FAILURE_THRESHOLD': 2},
+            INTEGRATIONS_HTTP={**settings.INTEGRATIONS_HTTP, 'RETRIES': 0},
+        ):
+            for _ in range(2):
+                with self.assertRaises(requests.exceptions.ConnectionError):
+                    http_client.get(url)
+            with self.assertRaises(CircuitOpenError):
+                http_client.get(url)
+            self.assertEqual(mock_session.return_value.get.call_count, 2)
+
+            mock_session.return_value.get.side_effect = None
+            mock_session.return_value.get.return_value = Mock(status_code=200)
+            with patch('integrations.services.circuit_breaker.time') as mock_time:
+                mock_time.time.return_value = time.time() + settings.CIRCUIT_BREAKER['RESET_TIMEOUT'] + 1
+                self.assertEqual(CircuitBreaker('api.example.com').state, 'half-open')
+                http_client.get(url)
+
+        self.assertEqual(CircuitBreaker('api.example.com').state, 'closed')
+
+    @patch('integrations.services.http_client.get_session')
+    def test_open_circuit_serves_last_weather_as_stale(self, mock_session):
+        """Test: while the circuit is open the last cached weather is returned with a stale flag"""
+        with patch('integrations.services.weather.WeatherService._fetch_weather', return_value={'погода': 'Clear'}):
+            WeatherService().get_weather('50.45', '30.52')
+
+        breaker = CircuitBreaker('api.openweathermap.org')
+        with self.settings(CIRCUIT_BREAKER={**settings.CIRCUIT_BREAKER, 'FAILURE_THRESHOLD': 1}):
+            breaker.record_failure()
+
+        expired = time.time() + settings.WEATHER_CACHE['TTL'] + settings.WEATHER_CACHE['STALE_TTL'] + 1
+        with patch('integrations.services.cache.time') as mock_time:
+            mock_time.time.return_value = expired
+            weather = WeatherService().get_weather('50.45', '30.52')
+
+        self.assertEqual(weather, {'погода': 'Clear', 'stale': True})
+        mock_session.return_value.get.assert_not_called()
+
+class UpstreamUnavailableResponseTestCase(APITestCase):
+    """Tests that refused upstream calls with nothing cached answer 429/503"""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+        self.point = TripPoint.objects.create(
+            trip=self.trip,
+            city="Kyiv",
+            country="Ukraine",
+            date=date.today(),
+            planned_budget=Decimal("100.00"),
+            latitude=50.45,
+            longitude=30.52,
+        )
+        self.client.force_authenticate(user=self.user)
+
+    @patch('integrations.services.currency.CurrencyService.get_rates', return_value={'UAH': 40.0})
+    @patch('integrations.services.http_client.get_session')
+    def test_weather_quota_exhausted_is_429(self, mock_session, mock_rates):
+        """Test: weather with its quota used up and nothing cached answers 429 with Retry-After"""
+        quotas = {'RESERVE': 0, 'PROVIDERS': {'api.openweathermap.org': {'RATE': 0.5, 'BURST': 1}}}
+
+        with self.settings(UPSTREAM_QUOTAS=quotas):
+            TokenBucket('api.openweathermap.org').acquire()
+            response = self.client.get(f'/api/trips/{self.trip.id}/points/{self.point.id}/weather/')
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '2')
+        mock_session.return_value.get.assert_not_called()
+
+    @patch('integrations.services.http_client.get_session')
+    def test_places_open_circuit_is_503(self, mock_session):
+        """Test: places with an open circuit and nothing cached answer 503 with Retry-After"""
+        with self.settings(CIRCUIT_BREAKER={**settings.CIRCUIT_BREAKER, 'FAILURE_THRESHOLD': 1}):
+            CircuitBreaker('api.geoapify.com').record_failure()
+
+        response = self.client.get(f'/api/trips/{self.trip.id}/points/{self.point.id}/places-nearby/')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertTrue(0 < int(response['Retry-After']) <= settings.CIRCUIT_BREAKER['RESET_TIMEOUT'])
+        mock_session.return_value.get.assert_not_called()
+
+
+class UpstreamQuotaTestCase(APITestCase):
+    """Tests for the per-provider token bucket"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = 'https://api.example.com/data'
+        self.quotas = {'RESERVE': 0.5, 'PROVIDERS': {'api.example.com': {'RATE': 1, 'BURST': 2}}}
+
+    @patch('integrations.services.http_client.get_session')
+    def test_bucket_limits_and_refills(self, mock_session):
+        """Test: calls beyond the burst fail fast until tokens refill"""
+        mock_session.return_value.get.return_value = Mock(status_code=200)
+
+        with self.settings(UPSTREAM_QUOTAS=self.quotas):
+            http_client.get(self.url)
+            http_client.get(self.url)
+            with self.assertRaises(QuotaExceededError):
+                http_client.get(self.url)
+
+            with patch('integrations.services.rate_limiter.time') as mock_time:
+                mock_time.time.return_value = time.time() + 1
+                http_client.get(self.url)
+
+        self.assertEqual(mock_session.return_value.get.call_count, 3)
+
+    def test_background_calls_leave_reserve(self):
+        """Test: background refreshes stop at the reserve that user requests may still spend"""
+        with self.settings(UPSTREAM_QUOTAS=self.quotas):
+            bucket = TokenBucket('api.example.com')
+            with rate_limiter.background():
+                bucket.acquire()
+                with self.assertRaises(QuotaExceededError):
+                    bucket.acquire()
+            bucket.acquire()
+
+    @patch('integrations.services.http_client.get_session')
+    def test_too_many_requests_drains_bucket(self, mock_session):
+        """Test: a 429 answer empties the bucket and the stats command shows it"""
+        mock_session.return_value.get.return_value = Mock(status_code=429)
+
+        stdout = io.StringIO()
+        with self.settings(UPSTREAM_QUOTAS=self.quotas):
+            http_client.get(self.url)
+            call_command('integrations_stats', stdout=stdout)
+
+        self.assertIn('api.example.com: quota_remaining=0', stdout.getvalue())
+
+@patch('integrations.services.currency.CurrencyService.get_rates', return_value={'UAH': 40.0})
+class TripPointPlacesCacheTestCase(APITestCase):
+    """Tests for cached and prefetched nearby places"""
+
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        self.point = TripPoint.objects.create(
+            trip=self.trip,
+            city="Kyiv",
+            country="Ukraine",
+            date=date.today() + timedelta(days=1),
+            planned_budget=Decimal("100.00"),
+            latitude=50.4501,
+            longitude=30.5234
+        )
+
+        self.places = [{'назва': 'Golden Gate', 'відстань': 5}]
+        self.client.force_authenticate(user=self.user)
+
+    @patch('integrations.services.places.PlacesService._fetch_places')
+    def test_places_cached_between_requests(self, mock_fetch, mock_rates):
+        """Test: repeat reads are served from the places cache"""
+        mock_fetch.return_value = self.places
+        url = f'/api/trips/{self.trip.id}/points/{self.point.id}/places-nearby/'
+
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(response.data, self.places)
+        mock_fetch.assert_called_once()
+
+    @patch('route_points.places.close_old_connections')
+    @patch('route_points.places._prefetch_executor')
+    @patch('integrations.services.places.PlacesService._fetch_places')
+    def test_places_prefetched_on_create(self, mock_fetch, mock_executor, mock_close, mock_rates):
+        """Test: creating a point stores its nearby places after commit"""
+        mock_fetch.return_value = self.places
+        # Run the background job inline; the test's transaction is invisible to other threads
+        mock_executor.submit.side_effect = lambda fn, *args: fn(*args)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/trips/{self.trip.id}/points/', {
+                'city': 'Lviv',
+                'country': 'Ukraine',
+                'date': date.today() + timedelta(days=2),
+                'planned_budget': '150.00',
+                'latitude': 49.8397,
+                'longitude': 24.0297
+            }, format='json')
+
+        prefetched = TripPointPlaces.objects.get(point_id=response.data['id'])
+        self.assertEqual(prefetched.places, self.places)
+
+        cache.clear()
+        url = f'/api/trips/{self.trip.id}/points/{response.data["id"]}/places-nearby/'
+        self.assertEqual(self.client.get(url).data, self.places)
+        mock_fetch.assert_called_once()
+
+    @patch('route_points.places._prefetch_executor')
+    @patch('integrations.services.places.PlacesService._fetch_places')
+    def test_places_prefetch_off_request_path(self, mock_fetch, mock_executor, mock_rates):
+        """Test: the places API is not called while the create request runs"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/trips/{self.trip.id}/points/', {
+                'city': 'Lviv',
+                'country': 'Ukraine',
+                'date': date.today() + timedelta(days=2),
+                'planned_budget': '150.00',
+                'latitude': 49.8397,
+                'longitude': 24.0297
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        mock_fetch.assert_not_called()
+        mock_executor.submit.assert_called_once()
+
+    @patch('route_points.views.schedule_prefetch_nearby_places')
+    def test_places_prefetched_only_when_coordinates_change(self, mock_prefetch, mock_rates):
+        """Test: updates without new coordinates do not refetch places"""
+        url = f'/api/trips/{self.trip.id}/points/{self.point.id}/'
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {'city': 'Kyiv Renamed'}, format='json')
+        mock_prefetch.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {'latitude': 50.46}, format='json')
+        mock_prefetch.assert_called_once()
+
+    @patch('integrations.services.places.PlacesService._fetch_places')
+    def test_prefetched_places_ignored_after_move(self, mock_fetch, mock_rates):
+        """Test: prefetched rows for old coordinates are not served"""
+        mock_fetch.return_value = self.places
+        TripPointPlaces.objects.create(
+            point=self.point,
+            latitude=0,
+            longitude=0,
+            radius=10,
+            categories='tourism.sights',
+            places=[{'назва': 'Elsewhere'}],
+        )
+
+        url = f'/api/trips/{self.trip.id}/points/{self.point.id}/places-nearby/'
+        self.assertEqual(self.client.get(url).data, self.places)
+
+
+class TripPointAsyncViewsTestCase(APITestCase):
+    """Tests for async weather and places-nearby views"""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+
+        self.factory = APIRequestFactory()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        self.other_user = User.objects.create_user(
+            username='otheruser',
+            password='testpass123',
+            email='othertestemail@gmail.com',
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        self.point = TripPoint.objects.create(
+            trip=self.trip,
+            city="Kyiv",
+            country="Ukraine",
+            date=date.today() + timedelta(days=1),
+            planned_budget=Decimal("100.00"),
+            latitude=50.4501,
+            longitude=30.5234
+        )
+
+    def call(self, view_class, user):
+        request = self.factory.get('/')
+        if user is not None:
+            force_authenticate(request, user=user)
+        response = async_to_sync(view_class.as_view())(request, trip_id=self.trip.id, pk=self.point.id)
+        return response.render()
+
+    @patch('integrations.services.currency.AsyncCurrencyService.get_rates', new_callable=AsyncMock)
+    @patch('integrations.services.weather.AsyncWeatherService._fetch_weather', new_callable=AsyncMock)
+    def test_async_weather(self, mock_weather, mock_rates):
+        """Test: async weather view returns the point with weather and local budget"""
+        mock_weather.return_value = {'погода': 'Clear'}
+        mock_rates.return_value = {'UAH': 40.0}
+
+        response = self.call(TripPointWeatherAsyncView, self.user)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(data['weather'], {'погода': 'Clear'})
+        self.assertEqual(data['local_budget'], '4000.0 UAH')
+        mock_weather.assert_awaited_once_with(50.45, 30.52, settings.WEATHER_API_KEY)
+
+    def test_async_places_nearby_prefetched(self):
+        """Test: async places view serves prefetched places"""
+        TripPointPlaces.objects.create(
+            point=self.point,
+            latitude=self.point.latitude,
+            longitude=self.point.longitude,
+            radius=10,
+            categories='tourism.sights',
+            places=[{'назва': 'Golden Gate'}],
+        )
+
+        response = self.call(TripPointPlacesNearbyAsyncView, self.user)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), [{'назва': 'Golden Gate'}])
+
+    def test_async_views_check_ownership(self):
+        """Test: async views reject anonymous users and other owners"""
+        self.assertEqual(
+            self.call(TripPointPlacesNearbyAsyncView, None).status_code,
+            status.HTTP_401_UNAUTHORIZED
+        )
+        self.assertEqual(
+            self.call(TripPointPlacesNearbyAsyncView, self.other_user).status_code,
+            status.HTTP_403_FORBIDDEN
+        )
+
+    def test_async_views_are_throttled(self):
+        """Test: async views apply the API's throttle classes"""
+        class OncePerMinute(UserRateThrottle):
+            rate = '1/min'
+
+        with patch('route_points.async_views.TripPointAsyncView.throttle_classes', [OncePerMinute]):
+            TripPointPlaces.objects.create(
+                point=self.point,
+                latitude=self.point.latitude,
+                longitude=self.point.longitude,
+                radius=10,
+                categories='tourism.sights',
+                places=[],
+            )
+            self.assertEqual(self.call(TripPointPlacesNearbyAsyncView, self.user).status_code, status.HTTP_200_OK)
+            response = self.call(TripPointPlacesNearbyAsyncView, self.user)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    def test_async_view_base_is_abstract(self):
+        """Test: the async base view cannot serve requests without get_point"""
+        with self.assertRaises(TypeError):
+            TripPointAsyncView()
+
+    def test_async_places_open_circuit_is_503(self):
+        """Test: async places view answers 503 with Retry-After while the circuit is open"""
+        with self.settings(CIRCUIT_BREAKER={**settings.CIRCUIT_BREAKER, 'FAILURE_THRESHOLD': 1}):
+            CircuitBreaker('api.geoapify.com').record_failure()
+
+        response = self.call(TripPointPlacesNearbyAsyncView, self.user)
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', response)
+
+    def test_async_client_retries_server_errors(self):
+        """Test: async HTTP client retries 5xx responses"""
+        statuses = iter([503, 200])
+
+        def handler(request):
+            return httpx.Response(next(statuses), json={})
+
+        async def fetch():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch('integrations.services.http_client.get_async_client', return_value=client):
+                return await http_client.aget('https://example.com')
+
+        with self.settings(INTEGRATIONS_HTTP={**settings.INTEGRATIONS_HTTP, 'RETRIES': 1, 'BACKOFF_FACTOR': 0}):
+            response = async_to_sync(fetch)()
+
+        self.assertEqual(response.status_code, 200)
+
+
+class TripPointQueryCountTestCase(APITestCase):
+    """Tests that trip point endpoints run a fixed number of queries"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        self.points = [
+            TripPoint.objects.create(
+                trip=self.trip,
+                city=f"City {day}",
+                country="Ukraine",
+                date=date.today() + timedelta(days=day),
+                planned_budget=Decimal("100.00"),
+            )
+            for day in range(5)
+        ]
+
+        self.client.force_authenticate(user=self.user)
+
+    @patch('integrations.services.currency.CurrencyService.get_rates')
+    def test_list_queries(self, mock_rates):
+        """Test: list runs trip lookup, ETag validator, count and page queries only"""
+        mock_rates.return_value = {'UAH': 40.0}
+
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/trips/{self.trip.id}/points/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @patch('integrations.services.currency.CurrencyService.get_rates')
+    def test_detail_queries(self, mock_rates):
+        """Test: detail runs one trip lookup and one point lookup"""
+        mock_rates.return_value = {'UAH': 40.0}
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/trips/{self.trip.id}/points/{self.points[0].id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @patch('integrations.services.weather.WeatherService.get_weather')
+    @patch('integrations.services.currency.CurrencyService.get_rates')
+    def test_weather_queries(self, mock_rates, mock_weather):
+        """Test: weather loads the point with its trip in one query"""
+        mock_rates.return_value = {'UAH': 40.0}
+        mock_weather.return_value = {'погода': 'Clear'}
+        self.points[0].latitude, self.points[0].longitude = 50.45, 30.52
+        self.points[0].save()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/trips/{self.trip.id}/points/{self.points[0].id}/weather/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @patch('integrations.services.currency.CurrencyService.get_rates')
+    def test_create_queries(self, mock_rates):
+        """Test: create looks up the trip once"""
+        mock_rates.return_value = {'UAH': 40.0}
+
+        with self.assertNumQueries(2):
+            response = self.client.post(f'/api/trips/{self.trip.id}/points/', {
+                'city': 'Lviv',
+                'country': 'Ukraine',
+                'date': date.today() + timedelta(days=2),
+                'planned_budget': '150.00',
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+@patch('integrations.services.currency.CurrencyService.get_rates', return_value={'UAH': 40.0})
+class TripPointBulkTestCase(APITestCase):
+    """Tests for bulk create/update/delete of trip points"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        self.other_user = User.objects.create_user(
+            username='otheruser',
+            password='testpass123',
+            email='othertestemail@gmail.com',
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        self.points = [
+            TripPoint.objects.create(
+                trip=self.trip,
+                city=f"City {day}",
+                country="Ukraine",
+                date=date.today() + timedelta(days=day),
+                planned_budget=Decimal("100.00"),
+            )
+            for day in range(3)
+        ]
+
+        self.url = f'/api/trips/{self.trip.id}/points/bulk/'
+        self.client.force_authenticate(user=self.user)
+
+    def point_data(self, city, days=1):
+        return {
+            'city': city,
+            'country': 'Ukraine',
+            'date': str(date.today() + timedelta(days=days)),
+            'planned_budget': '50.00',
+        }
+
+    def test_bulk_create(self, mock_rates):
+        """Test: a batch of points is created with a fixed number of queries"""
+        items = [self.point_data(f"New {i}") for i in range(20)]
+
+        with self.assertNumQueries(4):
+            response = self.client.post(self.url, items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 20)
+        self.assertEqual(response.data[0]['local_budget'], '2000.0 UAH')
+        self.assertEqual(TripPoint.objects.filter(trip=self.trip).count(), 23)
+
+    def test_bulk_create_reports_item_errors(self, mock_rates):
+        """Test: invalid items are reported per item and nothing is created"""
+        items = [self.point_data("Valid"), self.point_data("Too late", days=30)]
+
+        response = self.client.post(self.url, items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'][0], {})
+        self.assertIn('non_field_errors', response.data['errors'][1])
+        self.assertEqual(TripPoint.objects.filter(trip=self.trip).count(), 3)
+
+    def test_bulk_update(self, mock_rates):
+        """Test: points are updated together"""
+        items = [
+            {'id': self.points[0].id, 'city': 'Renamed'},
+            {'id': self.points[1].id, 'planned_budget': '10.00'},
+        ]
+
+        response = self.client.patch(self.url, items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.points[0].refresh_from_db()
+        self.points[1].refresh_from_db()
+        self.assertEqual(self.points[0].city, 'Renamed')
+        self.assertEqual(self.points[1].planned_budget, Decimal('10.00'))
+
+    def test_bulk_update_reports_unknown_points(self, mock_rates):
+        """Test: ids outside the trip are reported and nothing is updated"""
+        items = [
+            {'id': self.points[0].id, 'city': 'Renamed'},
+            {'id': 99999, 'city': 'Ghost'},
+        ]
+
+        response = self.client.patch(self.url, items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('id', response.data['errors'][1])
+        self.points[0].refresh_from_db()
+        self.assertEqual(self.points[0].city, 'City 0')
+
+    def test_bulk_update_rejects_malformed_ids(self, mock_rates):
+        """Test: ids that are not integers are reported per item without querying"""
+        items = [
+            {'id': 'abc', 'city': 'Bad'},
+            {'id': [self.points[0].id], 'city': 'Bad'},
+            {'city': 'No id'},
+            {'id': str(self.points[1].id), 'city': 'Renamed'},
+        ]
+
+        response = self.client.patch(self.url, items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data['errors']
+        self.assertIn('id', errors[0])
+        self.assertIn('id', errors[1])
+        self.assertIn('id', errors[2])
+        self.assertEqual(errors[3], {})
+
+    def test_bulk_update_rejects_repeated_ids(self, mock_rates):
+        """Test: a point listed twice is reported on its second item and nothing is saved"""
+        point = self.points[0]
+
+        response = self.client.patch(self.url, [
+            {'id': point.id, 'city': "First"},
+            {'id': point.id, 'city': "Second"},
+        ], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'][0], {})
+        self.assertIn('id', response.data['errors'][1])
+        point.refresh_from_db()
+        self.assertEqual(point.city, "City 0")
+
+    def test_bulk_update_accepts_numeric_string_ids(self, mock_rates):
+        """Test: an id sent as a numeric string matches its point"""
+        response = self.client.patch(self.url, [{'id': str(self.points[0].id), 'city': 'Renamed'}], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.points[0].refresh_from_db()
+        self.assertEqual(self.points[0].city, 'Renamed')
+
+    def test_bulk_delete_rejects_malformed_ids(self, mock_rates):
+        """Test: non-integer ids are a 400 and nothing is deleted"""
+        response = self.client.delete(self.url, {'ids': ['abc', self.points[0].id]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ids', response.data)
+        self.assertEqual(TripPoint.objects.filter(trip=self.trip).count(), 3)
+
+    def test_bulk_delete_accepts_numeric_string_ids(self, mock_rates):
+        """Test: ids sent as numeric strings are matched"""
+        response = self.client.delete(self.url, {'ids': [str(self.points[0].id)]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['deleted'], 1)
+
+    def test_bulk_delete(self, mock_rates):
+        """Test: listed points are deleted"""
+        ids = [self.points[0].id, self.points[1].id]
+
+        response = self.client.delete(self.url, {'ids': ids}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['deleted'], 2)
+        self.assertEqual(TripPoint.objects.filter(trip=self.trip).count(), 1)
+
+    def test_bulk_requires_trip_owner(self, mock_rates):
+        """Test: another user cannot bulk-create points in someone else's trip"""
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.client.post(self.url, [self.point_data("Intruder")], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(TripPoint.objects.filter(trip=self.trip).count(), 3)
+
+    def test_bulk_access_is_checked_before_ids(self, mock_rates):
+        """Test: another user sending malformed ids is refused rather than told what is wrong"""
+        self.client.force_authenticate(user=self.other_user)
+
+        update = self.client.patch(self.url, [{'id': 'abc', 'city': "Intruder"}], format='json')
+        delete = self.client.delete(self.url, {'ids': ['abc']}, format='json')
+
+        self.assertEqual(update.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(delete.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TripPointImportTestCase(APITestCase):
+    """Tests for importing trip points from files"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        self.url = f'/api/trips/{self.trip.id}/points/import/'
+        self.day = date.today() + timedelta(days=1)
+        self.client.force_authenticate(user=self.user)
+
+    def upload(self, name, content, **data):
+        return self.client.post(
+            self.url,
+            {'file': SimpleUploadedFile(name, content.encode()), **data},
+            format='multipart'
+        )
+
+    def test_import_csv_reports_bad_rows(self):
+        """Test: valid CSV rows are imported and bad rows are reported by line"""
+        content = (
+            "city,country,date,planned_budget,latitude,longitude\n"
+            f"Kyiv,Ukraine,{self.day},100.00,50.45,30.52\n"
+            f"Nowhere,Ukraine,{self.day},100.00,999,30.52\n"
+            f"Lviv,Ukraine,{self.day + timedelta(days=30)},100.00,49.84,24.03\n"
+            f"Odesa,Ukraine,{self.day},80.00,46.48,30.72\n"
+        )
+
+        response = self.upload('points.csv', content)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['failed'], 2)
+        self.assertEqual([error['line'] for error in response.data['errors']], [3, 4])
+        self.assertEqual(
+            sorted(TripPoint.objects.filter(trip=self.trip).values_list('city', flat=True)),
+            ['Kyiv', 'Odesa']
+        )
+
+    def test_import_ndjson_skips_trip_line(self):
+        """Test: NDJSON exports can be imported back"""
+        content = "\n".join([
+            json.dumps({'type': 'trip', 'title': 'Old Trip'}),
+            json.dumps({'type': 'point', 'city': 'Kyiv', 'country': 'Ukraine',
+                        'date': str(self.day), 'planned_budget': '100.00'}),
+            "not json",
+        ])
+
+        response = self.upload('points.ndjson', content)
+
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['line'], 3)
+
+    def test_import_gpx(self):
+        """Test: GPX waypoints and track points become trip points"""
+        content = f"""<?xml version="1.0"?>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">
+  <wpt lat="50.45" lon="30.52"><name>Kyiv</name><time>{self.day}T10:00:00Z</time></wpt>
+  <trk><trkseg>
+    <trkpt lat="49.84" lon="24.03"><name>Lviv</name><time>{self.day}T18:00:00Z</time></trkpt>
+  </trkseg></trk>
+</gpx>"""
+
+        response = self.upload('track.gpx', content, country='Ukraine')
+
+        self.assertEqual(response.data['created'], 2)
+        point = TripPoint.objects.get(trip=self.trip, city='Lviv')
+        self.assertEqual(point.country, 'Ukraine')
+        self.assertEqual(point.latitude, 49.84)
+        self.assertEqual(point.planned_budget, Decimal('0'))
+
+    def test_import_gpx_rejects_entities(self):
+        """Test: GPX files declaring entities are rejected instead of expanded"""
+        content = """<?xml version="1.0"?>
+<!DOCTYPE gpx [<!ENTITY lol "lol"><!ENTITY lol2 "&lol;&lol;&lol;&lol;">]>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">
+  <wpt lat="50.45" lon="30.52"><name>&lol2;</name></wpt>
+</gpx>"""
+
+        response = self.upload('track.gpx', content, country='Ukraine')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['created'], 0)
+        self.assertIn('Invalid GPX', str(response.data['errors'][0]['errors']))
+
+    def test_gpx_parser_detaches_points(self):
+        """Test: parsed GPX points do not stay referenced from the document root"""
+        points = "".join(f'<trkpt lat="49.{n}" lon="24.{n}"><name>P{n}</name></trkpt>' for n in range(50))
+        content = f'<gpx xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg>{points}</trkseg></trk></gpx>'
+        roots = []
+        iterparse = importers.iterparse
+
+        def spy(*args, **kwargs):
+            for event, element in iterparse(*args, **kwargs):
+                if not roots:
+                    roots.append(element)
+                yield event, element
+
+        with patch('route_points.importers.iterparse', spy):
+            rows = list(parse_gpx(io.BytesIO(content.encode())))
+
+        self.assertEqual(len(rows), 50)
+        self.assertEqual(list(roots[0].iter('{http://www.topografix.com/GPX/1/1}trkpt')), [])
+
+    def test_import_rejects_unknown_format(self):
+        """Test: files of unknown format are rejected"""
+        response = self.upload('points.xlsx', 'binary')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('format', response.data)
+
+    def test_import_command_inserts_in_batches(self):
+        """Test: the management command imports a file with fixed-size bulk inserts"""
+        rows = "".join(f"City {i},Ukraine,{self.day},10.00\n" for i in range(5))
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as file:
+            file.write("city,country,date,planned_budget\n" + rows)
+        self.addCleanup(os.unlink, file.name)
+
+        stdout = io.StringIO()
+        with patch('route_points.importers.TripPoint.objects.bulk_create', wraps=TripPoint.objects.bulk_create) as mock_bulk:
+            call_command('import_trip_points', self.trip.id, file.name, '--batch-size', '2', stdout=stdout)
+
+        self.assertEqual([len(call.args[0]) for call in mock_bulk.call_args_list], [2, 2, 1])
+        self.assertEqual(TripPoint.objects.filter(trip=self.trip).count(), 5)
+        self.assertIn('Imported 5 points', stdout.getvalue())
+
+
+class RefreshIntegrationsTestCase(APITestCase):
+    """Tests for the background cache refresher"""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=60),
+        )
+
+        for city, day, lat, lon in (
+            ("Kyiv", 1, 50.4501, 30.5234),
+            ("Kyiv Center", 2, 50.4512, 30.5239),
+            ("Lviv", 3, 49.8397, 24.0297),
+            ("Odesa", 30, 46.4825, 30.7233),
+        ):
+            TripPoint.objects.create(
+                trip=self.trip,
+                city=city,
+                country="Ukraine",
+                date=date.today() + timedelta(days=day),
+                planned_budget=Decimal("100.00"),
+                latitude=lat,
+                longitude=lon
+            )
+
+    @patch('integrations.services.currency.CurrencyService._fetch_rates')
+    @patch('integrations.services.weather.WeatherService._fetch_weather')
+    def test_refresh_renews_entries_of_upcoming_points(self, mock_weather, mock_rates):
+        """Test: rates and each upcoming weather cell expiring before the next run are fetched again"""
+        mock_rates.return_value = {'USD': 1, 'UAH': 41, 'EUR': 0.9, 'PLN': 4, 'GBP': 0.8}
+        mock_weather.return_value = {'погода': 'Clear'}
+        WeatherService().get_weather(50.4501, 30.5234)
+        CurrencyService().get_rates()
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        interval = str(settings.CURRENCY_RATES_TTL)
+        call_command('refresh_integrations', '--days', '7', '--interval', interval, stdout=stdout, stderr=stderr)
+
+        self.assertEqual(mock_rates.call_count, 2)
+        self.assertEqual(
+            sorted(call.args[:2] for call in mock_weather.call_args_list[1:]),
+            [(49.84, 24.03), (50.45, 30.52)]
+        )
+        self.assertIn('rates=1 weather=2 places=0, 0 still fresh, 0 failed', stdout.getvalue())
+        self.assertIn('No rates for: AED', stderr.getvalue())
+        self.assertNotIn('UAH', stderr.getvalue())
+
+    @patch('integrations.services.currency.CurrencyService._fetch_rates')
+    @patch('integrations.services.weather.WeatherService._fetch_weather')
+    def test_refresh_skips_entries_fresh_until_next_run(self, mock_weather, mock_rates):
+        """Test: cached values still fresh at the next run are not fetched again"""
+        mock_rates.return_value = {'USD': 1, 'UAH': 41}
+        mock_weather.return_value = {'погода': 'Clear'}
+        WeatherService().get_weather(50.4501, 30.5234)
+        CurrencyService().get_rates()
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command('refresh_integrations', '--days', '7', '--interval', '60', stdout=stdout, stderr=stderr)
+
+        self.assertEqual(mock_rates.call_count, 1)
+        self.assertEqual([call.args[:2] for call in mock_weather.call_args_list[1:]], [(49.84, 24.03)])
+        self.assertIn('rates=0 weather=1 places=0, 2 still fresh, 0 failed', stdout.getvalue())
+        self.assertEqual(stderr.getvalue(), '')
+
+    @patch('integrations.services.currency.CurrencyService._fetch_rates')
+    @patch('integrations.services.weather.WeatherService._fetch_weather')
+    def test_refresh_keeps_going_after_failures(self, mock_weather, mock_rates):
+        """Test: upstream errors are counted without stopping the run"""
+        mock_rates.side_effect = requests.exceptions.ConnectionError()
+        mock_weather.side_effect = [requests.exceptions.Timeout(), {'погода': 'Rain'}]
+
+        stdout = io.StringIO()
+        with self.assertLogs('route_points.refresher', level='ERROR') as logs:
+            call_command('refresh_integrations', stdout=stdout, stderr=io.StringIO())
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(mock_weather.call_count, 2)
+        self.assertIn('rates=0 weather=1 places=0, 0 still fresh, 2 failed', stdout.getvalue())
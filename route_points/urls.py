@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.urls import path
+from .async_views import TripPointPlacesNearbyAsyncView, TripPointWeatherAsyncView
 from .views import TripPointViewSet, WeatherViewSet
 
 trip_points_list = TripPointViewSet.as_view({
@@ -13,6 +15,16 @@ trip_points_detail = TripPointViewSet.as_view({
     "delete": "destroy",
 })
 
+trip_points_bulk = TripPointViewSet.as_view({
+    "post": "bulk_create",
+    "patch": "bulk_update",
+    "delete": "bulk_destroy",
+})
+
+trip_points_import = TripPointViewSet.as_view({
+    "post": "import_points",
+})
+
 trip_points_places_nearby = TripPointViewSet.as_view({
     "get": "places_nearby",
 })
@@ -21,6 +33,11 @@ weather_detail = WeatherViewSet.as_view({
     "get": "retrieve",
 })
 
+# Under ASGI these endpoints can wait on upstream APIs without holding a worker
+if settings.ASYNC_INTEGRATION_VIEWS:
+    trip_points_places_nearby = TripPointPlacesNearbyAsyncView.as_view()
+    weather_detail = TripPointWeatherAsyncView.as_view()
+
 urlpatterns = [
     path(
         "<int:trip_id>/points/",
@@ -28,6 +45,18 @@ urlpatterns = [
         name="trip-points-list"
     ),
 
+    path(
+        "<int:trip_id>/points/bulk/",
+        trip_points_bulk,
+        name="trip-points-bulk"
+    ),
+
+    path(
+        "<int:trip_id>/points/import/",
+        trip_points_import,
+        name="trip-points-import"
+    ),
+
     path(
         "<int:trip_id>/points/<int:pk>/",
         trip_points_detail,
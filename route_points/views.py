@@ -1,32 +1,87 @@
-from rest_framework import viewsets, permissions
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers, viewsets, permissions
 from rest_framework.decorators import action
-from rest_framework.exceptions import NotFound, PermissionDenied
-from rest_framework.status import HTTP_404_NOT_FOUND
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.fields import empty
+from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
 from rest_framework.response import Response
 
-from travel_planner_api import settings
+from core.caching import CachedResponseMixin, invalidate, trip_scope
+from core.conditional import ConditionalGetMixin
+from core.fieldsets import SparseFieldsetViewMixin
+from core.pagination import OptionalCursorPaginationMixin, TripPointCursorPagination
 from core.permissions import IsOwnerPermission
 
-from integrations.services.places import PlacesService
+from integrations.services.currency import CurrencyService
 from integrations.services.weather import WeatherService
 
+from .importers import detect_format, import_points
+from .places import get_nearby_places, schedule_prefetch_nearby_places
 from .serializers import TripPointSerializer
 from route_points.models import TripPoint
 from trips.models import Trip
 
 
-class TripPointViewSet(viewsets.ModelViewSet):
+class TripPointViewSet(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SparseFieldsetViewMixin,
+    OptionalCursorPaginationMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = TripPointSerializer
+    cursor_pagination_class = TripPointCursorPagination
     permission_classes = [permissions.IsAuthenticated, IsOwnerPermission]
+    sparse_field_sources = {'local_budget': ('planned_budget', 'country')}
+    # trip.points attaches the already loaded trip to every row through trip_id
+    sparse_required_fields = ('id', 'trip', 'date')
+    # local_budget follows the exchange rates too, not only the rows
+    weak_etag = True
+
+    def get_cache_scopes(self):
+        return [trip_scope(self.kwargs.get("trip_id"))]
+
+    def get_cache_versions(self):
+        # A refetched rate table changes local_budget without touching any row
+        return [self.get_rates_fetched_at()]
+
+    def get_list_validators(self, queryset):
+        # The trip's base currency and the rate table change every local_budget
+        return [*super().get_list_validators(queryset), self.get_trip().updated_at, self.get_rates_fetched_at()]
+
+    def get_object_validators(self, obj):
+        rates_fetched_at = self.get_rates_fetched_at()
+        last_modified = max(filter(None, (obj.updated_at, obj.trip.updated_at, rates_fetched_at)))
+        return [obj.pk, obj.trip.updated_at, rates_fetched_at], last_modified
+
+    def get_rates_fetched_at(self):
+        """
+        Returns when the rate table was fetched, looked up once per request
+        """
+        if not hasattr(self, '_rates_fetched_at'):
+            timestamp = CurrencyService().rates_fetched_at()
+            self._rates_fetched_at = datetime.fromtimestamp(timestamp, tz=dt_timezone.utc) if timestamp else None
+        return self._rates_fetched_at
 
     def get_trip(self):
-        trip_id = self.kwargs.get("trip_id")
-        if not trip_id:
-            return None
-        try:
-            return Trip.objects.get(id=trip_id)
-        except Trip.DoesNotExist:
-            raise NotFound("Trip not found")
+        """
+        Returns the trip from the URL, looked up once per request
+        """
+        if not hasattr(self, '_trip'):
+            trip_id = self.kwargs.get("trip_id")
+            if not trip_id:
+                self._trip = None
+            else:
+                try:
+                    self._trip = Trip.objects.get(id=trip_id)
+                except Trip.DoesNotExist:
+                    raise NotFound("Trip not found")
+        return self._trip
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -36,10 +91,10 @@ class TripPointViewSet(viewsets.ModelViewSet):
         if trip is None:
             return TripPoint.objects.none()
 
-        if trip.user != self.request.user:
+        if trip.user_id != self.request.user.pk:
             raise PermissionDenied("You do not have access to this trip's points.")
 
-        return trip.points.all()
+        return trip.points.select_related('trip').order_by('date', 'id')
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -52,28 +107,177 @@ class TripPointViewSet(viewsets.ModelViewSet):
     def places_nearby(self, request, trip_id=None, pk=None):
         point = self.get_object()  # TripPoint instance
 
-        # init service
-        places_service = PlacesService(settings.PLACES_API_KEY)
+        data = get_nearby_places(point)
+
+        return Response(data)
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request, trip_id=None):
+        """
+        Creates a list of points in one transaction, or none if any item is invalid
+        """
+        self.get_queryset()  # checks access to the trip
+        items = self.get_bulk_items(request.data)
+
+        serializer = self.get_serializer(data=items, many=True)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            serializer.save(trip=self.get_trip())
+
+        return Response(serializer.data, status=HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request, trip_id=None):
+        """
+        Partially updates a list of points identified by ``id`` in one transaction
+        """
+        queryset = self.get_queryset()  # checks access to the trip
+        items = self.get_bulk_items(request.data)
+
+        # Ids are checked before they reach the ORM so bad input is a 400, not a 500
+        ids, errors = [], []
+        for item in items:
+            if not isinstance(item, dict):
+                ids.append(None)
+                errors.append({"non_field_errors": ["Expected an object with an id."]})
+                continue
+            try:
+                point_id = serializers.IntegerField().run_validation(item.get('id', empty))
+            except ValidationError as exc:
+                ids.append(None)
+                errors.append({"id": exc.detail})
+                continue
+            # Two updates of one point would both apply and the row be returned twice
+            errors.append({"id": ["Point is listed more than once."]} if point_id in ids else {})
+            ids.append(point_id)
+        if any(errors):
+            return Response({"errors": errors}, status=HTTP_400_BAD_REQUEST)
+
+        points = queryset.in_bulk(ids)
+
+        errors = []
+        item_serializers = []
+        for item, point_id in zip(items, ids):
+            point = points.get(point_id)
+            if point is None:
+                errors.append({"id": ["Point not found in this trip."]})
+                continue
+            serializer = self.get_serializer(point, data=item, partial=True)
+            serializer.is_valid()
+            errors.append(serializer.errors)
+            item_serializers.append(serializer)
 
-        # call API
-        data = places_service.get_nearby_places(
-            lat=point.latitude,
-            lon=point.longitude,
-            radius=10,
-            categories="tourism.sights"
+        if any(errors):
+            return Response({"errors": errors}, status=HTTP_400_BAD_REQUEST)
+
+        updated_fields = set()
+        for serializer in item_serializers:
+            for field, value in serializer.validated_data.items():
+                setattr(serializer.instance, field, value)
+                updated_fields.add(field)
+
+        updated = [serializer.instance for serializer in item_serializers]
+        if updated_fields:
+            # bulk_update does not apply auto_now
+            now = timezone.now()
+            for point in updated:
+                point.updated_at = now
+            updated_fields.add('updated_at')
+            with transaction.atomic():
+                TripPoint.objects.bulk_update(updated, sorted(updated_fields))
+            invalidate(trip_scope(self.get_trip().pk))
+
+        return Response(self.get_serializer(updated, many=True).data)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request, trip_id=None):
+        """
+        Deletes the points listed in ``ids``; nothing is deleted if any id is unknown
+        """
+        queryset = self.get_queryset()  # checks access to the trip
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not ids:
+            raise ValidationError({"ids": ["Expected a non-empty list of point ids."]})
+        self.check_bulk_size(ids)
+        try:
+            ids = serializers.ListField(child=serializers.IntegerField()).run_validation(ids)
+        except ValidationError as exc:
+            raise ValidationError({"ids": exc.detail})
+
+        points = queryset.filter(id__in=ids)
+        found = set(points.values_list('id', flat=True))
+        missing = [point_id for point_id in ids if point_id not in found]
+        if missing:
+            return Response(
+                {"errors": {"ids": [f"Points not found in this trip: {missing}"]}},
+                status=HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            TripPoint.objects.filter(id__in=found).delete()
+
+        return Response({"deleted": len(found)})
+
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser, FormParser])
+    def import_points(self, request, trip_id=None):
+        """
+        Imports points from an uploaded CSV, NDJSON or GPX file.
+        Valid rows are inserted in batches; invalid rows are reported by line.
+        """
+        self.get_queryset()  # checks access to the trip
+
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({"file": ["No file was submitted."]})
+
+        import_format = detect_format(upload.name, request.data.get('format'))
+        if import_format is None:
+            raise ValidationError({"format": ["Expected one of: csv, ndjson, gpx."]})
+
+        result = import_points(
+            self.get_trip(),
+            upload,
+            import_format,
+            defaults={
+                'country': request.data.get('country'),
+                'planned_budget': request.data.get('planned_budget'),
+            },
         )
 
-        return Response(data)
+        return Response(result.as_dict(), status=HTTP_201_CREATED if result.created else HTTP_400_BAD_REQUEST)
+
+    def get_bulk_items(self, data):
+        if not isinstance(data, list) or not data:
+            raise ValidationError({"non_field_errors": ["Expected a non-empty list of items."]})
+        self.check_bulk_size(data)
+        return data
+
+    def check_bulk_size(self, items):
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise ValidationError({"non_field_errors": [f"At most {settings.BULK_MAX_ITEMS} items per request."]})
 
     def perform_create(self, serializer):
         trip = self.get_trip()
         if trip is None:
             raise NotFound("Trip not found")
-        serializer.save(trip=trip)
+        point = serializer.save(trip=trip)
+        self.schedule_places_prefetch(point)
+
+    def perform_update(self, serializer):
+        old_coordinates = (serializer.instance.latitude, serializer.instance.longitude)
+        point = serializer.save()
+        if (point.latitude, point.longitude) != old_coordinates:
+            self.schedule_places_prefetch(point)
+
+    def schedule_places_prefetch(self, point):
+        if settings.PLACES_PREFETCH_ON_SAVE and point.latitude and point.longitude:
+            schedule_prefetch_nearby_places(point)
 
 
 class WeatherViewSet(viewsets.ModelViewSet):
-    queryset = TripPoint.objects.all()
+    queryset = TripPoint.objects.select_related('trip')
     serializer_class = TripPointSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerPermission]
 
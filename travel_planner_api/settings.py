@@ -79,9 +79,41 @@ DATABASES = {
         'PASSWORD': env('POSTGRES_PASSWORD'),
         'HOST': env('POSTGRES_HOST'),
         'PORT': env('POSTGRES_PORT'),
+        # Keep connections open between requests and check them before reuse
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': True,
+        # Transaction-pooling pgbouncer cannot keep server-side cursors between queries
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool('DB_PGBOUNCER', default=False),
+        'OPTIONS': {},
     }
 }
 
+# psycopg 3 connection pool per worker process; replaces persistent connections
+# (Django rejects CONN_MAX_AGE together with a pool). Suited to uvicorn workers,
+# where connections are not reused across requests otherwise
+if env.bool('DB_POOL', default=False):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+        'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+        'timeout': env.float('DB_POOL_TIMEOUT', default=10),
+    }
+
+
+# Shared by integrations, counters, quotas and response caching. Use a Redis URL
+# (redis://redis:6379/1) in production so every worker sees the same entries;
+# locmemcache:// or filecache:///path suit tests. Bump CACHE_VERSION to drop all keys
+CACHES = {
+    'default': {
+        **env.cache('CACHE_URL', default='locmemcache://'),
+        'KEY_PREFIX': env('CACHE_KEY_PREFIX', default='travel_planner'),
+        'VERSION': env.int('CACHE_VERSION', default=1),
+    }
+}
+
+# Seconds trip and point list/detail responses are cached per user; 0 disables it
+RESPONSE_CACHE_TTL = env.int('RESPONSE_CACHE_TTL', default=0)
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -126,8 +158,19 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 12,
+    # Unavailable upstreams answer 429/503 with Retry-After
+    'EXCEPTION_HANDLER': 'core.exceptions.exception_handler',
 }
 
+# Largest batch accepted by the bulk trip point endpoints
+BULK_MAX_ITEMS = env.int('BULK_MAX_ITEMS', default=500)
+
+# Rows inserted per bulk_create while importing points from files
+IMPORT_BATCH_SIZE = env.int('IMPORT_BATCH_SIZE', default=1000)
+
+# Rows fetched per database round-trip while streaming exports
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -142,4 +185,86 @@ SWAGGER_SETTINGS = {
 }
 
 
+# Integrations
+INTEGRATIONS_HTTP = {
+    'CONNECT_TIMEOUT': env.float('INTEGRATIONS_CONNECT_TIMEOUT', default=3.05),
+    'READ_TIMEOUT': env.float('INTEGRATIONS_READ_TIMEOUT', default=5),
+    'POOL_CONNECTIONS': env.int('INTEGRATIONS_POOL_CONNECTIONS', default=10),
+    'POOL_MAXSIZE': env.int('INTEGRATIONS_POOL_MAXSIZE', default=10),
+    'RETRIES': env.int('INTEGRATIONS_RETRIES', default=2),
+    'BACKOFF_FACTOR': env.float('INTEGRATIONS_BACKOFF_FACTOR', default=0.3),
+}
+
+# An upstream host failing FAILURE_THRESHOLD times in a row is not called for RESET_TIMEOUT
+# seconds; cached values are kept FALLBACK_TTL seconds past expiry to be served meanwhile
+CIRCUIT_BREAKER = {
+    'FAILURE_THRESHOLD': env.int('CIRCUIT_BREAKER_FAILURE_THRESHOLD', default=5),
+    'RESET_TIMEOUT': env.int('CIRCUIT_BREAKER_RESET_TIMEOUT', default=30),
+    'FALLBACK_TTL': env.int('CIRCUIT_BREAKER_FALLBACK_TTL', default=24 * 60 * 60),
+}
+
+# Token buckets per provider host shared by all workers: RATE tokens per second refill up
+# to BURST. Background refreshes leave RESERVE (a share of BURST) for requests with no
+# cached value to fall back on
+UPSTREAM_QUOTAS = {
+    'RESERVE': env.float('UPSTREAM_QUOTA_RESERVE', default=0.2),
+    'PROVIDERS': {
+        # OpenWeatherMap free plan: 60 calls per minute
+        'api.openweathermap.org': {
+            'RATE': env.float('WEATHER_QUOTA_RATE', default=1),
+            'BURST': env.int('WEATHER_QUOTA_BURST', default=60),
+        },
+        # Geoapify free plan: 3000 credits per day
+        'api.geoapify.com': {
+            'RATE': env.float('PLACES_QUOTA_RATE', default=3000 / (24 * 60 * 60)),
+            'BURST': env.int('PLACES_QUOTA_BURST', default=100),
+        },
+        # open.er-api.com updates rates daily and throttles frequent callers
+        'open.er-api.com': {
+            'RATE': env.float('CURRENCY_QUOTA_RATE', default=1 / 60),
+            'BURST': env.int('CURRENCY_QUOTA_BURST', default=10),
+        },
+    },
+}
+
+# Concurrent cache misses of one key wait on a lock while a single caller fetches it;
+# LOCK_TIMEOUT should outlast a fetch with all its retries
+INTEGRATIONS_SINGLE_FLIGHT = {
+    'LOCK_TIMEOUT': env.int('INTEGRATIONS_LOCK_TIMEOUT', default=30),
+    'POLL_INTERVAL': env.float('INTEGRATIONS_LOCK_POLL_INTERVAL', default=0.05),
+}
+
+CURRENCY_RATES_TTL = env.int('CURRENCY_RATES_TTL', default=60 * 60)
+
+WEATHER_CACHE = {
+    # 2 decimal places of lat/lon is a grid of roughly 1 km
+    'PRECISION': env.int('WEATHER_CACHE_PRECISION', default=2),
+    'TTL': env.int('WEATHER_CACHE_TTL', default=10 * 60),
+    'STALE_TTL': env.int('WEATHER_CACHE_STALE_TTL', default=30 * 60),
+}
+
+PLACES_CACHE = {
+    # 4 decimal places of lat/lon is a grid of roughly 10 m
+    'PRECISION': env.int('PLACES_CACHE_PRECISION', default=4),
+    'TTL': env.int('PLACES_CACHE_TTL', default=7 * 24 * 60 * 60),
+}
+# Points created or moved get their nearby places prefetched on this many background threads
+PLACES_PREFETCH_ON_SAVE = env.bool('PLACES_PREFETCH_ON_SAVE', default=True)
+PLACES_PREFETCH_WORKERS = env.int('PLACES_PREFETCH_WORKERS', default=2)
+
+# refresh_integrations renews rates and weather of points dated within this many days,
+# every REFRESH_INTERVAL seconds in --loop mode (keep it below WEATHER_CACHE['TTL'])
+REFRESH_UPCOMING_DAYS = env.int('REFRESH_UPCOMING_DAYS', default=7)
+REFRESH_INTERVAL = env.int('REFRESH_INTERVAL', default=5 * 60)
+
+# New points without a city/country get them from the nearest bundled city within this distance
+GEOCODING_MAX_DISTANCE_KM = env.float('GEOCODING_MAX_DISTANCE_KM', default=150)
+
+# Upper bound of concurrent upstream calls made for one itinerary
+ITINERARY_MAX_WORKERS = env.int('ITINERARY_MAX_WORKERS', default=8)
+
+# Serve weather/ and places-nearby/ with async views (only worth it under ASGI)
+ASYNC_INTEGRATION_VIEWS = env.bool('ASYNC_INTEGRATION_VIEWS', default=False)
+
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -0,0 +1,36 @@
+"""
+Settings profile for gunicorn/uvicorn deployments:
+DJANGO_SETTINGS_MODULE=travel_planner_api.settings_production
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import MIDDLEWARE, REST_FRAMEWORK, env
+
+DEBUG = False
+
+# Static files (admin, Swagger UI) are served by the app server instead of runserver
+MIDDLEWARE = [
+    MIDDLEWARE[0],
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    *MIDDLEWARE[1:],
+]
+WHITENOISE_USE_FINDERS = env.bool('WHITENOISE_USE_FINDERS', default=True)
+
+# JSON only: the browsable API renders templates and forms on every response
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': (
+        'rest_framework.renderers.JSONRenderer',
+    ),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': env('LOG_LEVEL', default='WARNING'),
+    },
+}
@@ -0,0 +1,84 @@
+from collections import defaultdict
+from decimal import Decimal
+
+import requests
+from django.db.models import Count, Sum
+
+from integrations.services.currency import COUNTRY_TO_CURRENCY, CurrencyService
+
+CENTS = Decimal('0.01')
+
+
+def build_budget(trip):
+    """
+    Returns the trip's planned budget totals per country, currency and day.
+
+    Totals come from one GROUP BY (country, date) query. Each currency group is
+    then converted once with the cached rate table of the trip's base currency.
+    """
+    rows = (
+        trip.points.order_by()
+        .values('country', 'date')
+        .annotate(total=Sum('planned_budget'), points=Count('id'))
+    )
+
+    by_country = defaultdict(lambda: {'total': Decimal('0'), 'points': 0})
+    by_day = defaultdict(lambda: {'total': Decimal('0'), 'points': 0})
+    for row in rows:
+        for group in (by_country[row['country']], by_day[row['date']]):
+            group['total'] += row['total']
+            group['points'] += row['points']
+
+    by_currency = defaultdict(lambda: {'total': Decimal('0'), 'points': 0})
+    for country, group in by_country.items():
+        currency = by_currency[COUNTRY_TO_CURRENCY.get(country)]
+        currency['total'] += group['total']
+        currency['points'] += group['points']
+
+    rates = _get_rates(trip.base_currency) if any(by_currency) else {}
+
+    return {
+        'base_currency': trip.base_currency,
+        'total': _amount(sum((group['total'] for group in by_country.values()), Decimal('0'))),
+        'points': sum(group['points'] for group in by_country.values()),
+        'by_country': [
+            {
+                'country': country,
+                'currency': COUNTRY_TO_CURRENCY.get(country),
+                'total': _amount(group['total']),
+                'points': group['points'],
+            }
+            for country, group in sorted(by_country.items())
+        ],
+        'by_currency': [
+            {
+                'currency': currency,
+                'total': _amount(group['total']),
+                'points': group['points'],
+                'rate': rates.get(currency),
+                'local_total': _local_total(group['total'], rates.get(currency)),
+            }
+            for currency, group in sorted(by_currency.items(), key=lambda item: item[0] or '')
+        ],
+        'by_day': [
+            {'date': day, 'total': _amount(group['total']), 'points': group['points']}
+            for day, group in sorted(by_day.items())
+        ],
+    }
+
+
+def _get_rates(base_currency):
+    try:
+        return CurrencyService(base_currency=base_currency).get_rates()
+    except (requests.exceptions.RequestException, KeyError, ValueError):
+        return {}
+
+
+def _amount(value):
+    return str(value.quantize(CENTS))
+
+
+def _local_total(total, rate):
+    if rate is None:
+        return None
+    return _amount(total * Decimal(str(rate)))
@@ -0,0 +1,98 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.negotiation import BaseContentNegotiation
+
+POINT_FIELDS = (
+    'id',
+    'city',
+    'country',
+    'date',
+    'planned_budget',
+    'latitude',
+    'longitude',
+    'created_at',
+)
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+class ExportContentNegotiation(BaseContentNegotiation):
+    """
+    Picks the first renderer whatever the client accepts. Exports stream their own
+    CSV/NDJSON responses, so only their errors are rendered, always as JSON.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+def _point_rows(trip):
+    return (
+        trip.points.order_by('date', 'id')
+        .values_list(*POINT_FIELDS)
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    )
+
+
+def stream_csv(trip):
+    """
+    Yields the trip's points as CSV lines, one row per point
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(['trip_id', 'trip_title', 'base_currency', *POINT_FIELDS])
+
+    for row in _point_rows(trip):
+        yield writer.writerow([trip.id, trip.title, trip.base_currency, *row])
+
+
+def stream_ndjson(trip):
+    """
+    Yields the trip as the first JSON line, followed by one line per point
+    """
+    yield _json_line({
+        'type': 'trip',
+        'id': trip.id,
+        'title': trip.title,
+        'description': trip.description,
+        'start_date': trip.start_date,
+        'end_date': trip.end_date,
+        'base_currency': trip.base_currency,
+    })
+
+    for row in _point_rows(trip):
+        yield _json_line({'type': 'point', **dict(zip(POINT_FIELDS, row))})
+
+
+async def aiterate(lines):
+    """
+    Yields a sync stream in batches of EXPORT_CHUNK_SIZE lines read off the event loop.
+    Django's ASGI handler would otherwise buffer a sync iterator whole before sending it.
+    """
+    lines = iter(lines)
+    next_batch = sync_to_async(lambda: list(islice(lines, settings.EXPORT_CHUNK_SIZE)))
+
+    while batch := await next_batch():
+        yield ''.join(batch)
+
+
+def _json_line(data):
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson; charset=utf-8'),
+}
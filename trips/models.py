@@ -12,5 +12,11 @@ class Trip(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Trips are listed per user in start date order
+            models.Index(fields=['user', 'start_date'], name='trip_user_start_date_idx'),
+        ]
+
     def __str__(self):
         return self.title
\ No newline at end of file
@@ -1,8 +1,10 @@
 from rest_framework import serializers
+
+from core.fieldsets import SparseFieldsetSerializerMixin
 from trips.models import Trip
 
 
-class TripSerializer(serializers.ModelSerializer):
+class TripSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Trip
         fields = (
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.caching import invalidate, trip_scope, user_scope
+from trips.models import Trip
+
+
+@receiver([post_save, post_delete], sender=Trip)
+def invalidate_trip_responses(sender, instance, **kwargs):
+    invalidate(user_scope(instance.user_id), trip_scope(instance.pk))
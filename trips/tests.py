@@ -1,8 +1,26 @@
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
 from datetime import date, timedelta
-
+from decimal import Decimal
+from urllib.parse import urlencode
+import base64
+import csv
+import io
+import json
+import time
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from integrations.services.cache import clear_local_cache
+from integrations.services.currency import CurrencyService
+from route_points.models import TripPoint
 from trips.models import Trip
 
 User = get_user_model()
@@ -50,6 +68,20 @@ class TripCRUDTestCase(APITestCase):
         else:
             self.assertGreaterEqual(len(response.data), 1)
 
+    def test_trips_list_ordered_by_start_date(self):
+        """Test: trips are listed by start date"""
+        Trip.objects.create(
+            user=self.user,
+            title="Earlier Trip",
+            start_date=date.today() - timedelta(days=30),
+            end_date=date.today() - timedelta(days=20),
+        )
+
+        response = self.client.get('/api/trips/')
+
+        titles = [trip['title'] for trip in response.data['results']]
+        self.assertEqual(titles, ['Earlier Trip', 'Test Trip'])
+
     def test_create_trip(self):
         """Test: creating a new trip"""
         url = '/api/trips/'
@@ -174,6 +206,97 @@ class TripCRUDTestCase(APITestCase):
         self.assertEqual(Trip.objects.count(), 1)
 
 
+class TripCursorPaginationTestCase(APITestCase):
+    """Tests for opt-in cursor pagination of trips"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        for day in range(5):
+            Trip.objects.create(
+                user=self.user,
+                title=f"Trip {day}",
+                start_date=date.today() + timedelta(days=day),
+                end_date=date.today() + timedelta(days=day + 1),
+            )
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_cursor_pagination_walks_all_pages(self):
+        """Test: following cursor links returns every trip once, in order"""
+        response = self.client.get('/api/trips/?pagination=cursor&page_size=2')
+
+        self.assertNotIn('count', response.data)
+        titles = [trip['title'] for trip in response.data['results']]
+
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            titles.extend(trip['title'] for trip in response.data['results'])
+
+        self.assertEqual(titles, [f"Trip {day}" for day in range(5)])
+
+    def test_cursor_pages_through_equal_start_dates(self):
+        """Test: trips sharing a start date are paged by (start_date, id) without OFFSET"""
+        for number in range(5):
+            Trip.objects.create(
+                user=self.user,
+                title=f"Same day {number}",
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=1),
+            )
+        expected = list(Trip.objects.filter(user=self.user).order_by('start_date', 'id').values_list('title', flat=True))
+
+        response = self.client.get('/api/trips/?pagination=cursor&page_size=2')
+        titles = [trip['title'] for trip in response.data['results']]
+        while response.data['next']:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(response.data['next'])
+            self.assertFalse(any('OFFSET' in query['sql'] for query in queries.captured_queries))
+            titles.extend(trip['title'] for trip in response.data['results'])
+
+        self.assertEqual(titles, expected)
+
+        # Walking back from the last page returns the same pages
+        titles = [trip['title'] for trip in response.data['results']]
+        while response.data['previous']:
+            response = self.client.get(response.data['previous'])
+            titles[:0] = [trip['title'] for trip in response.data['results']]
+        self.assertEqual(titles, expected)
+
+    def test_invalid_cursor_is_not_found(self):
+        """Test: a cursor that does not decode to a position is rejected"""
+        response = self.client.get('/api/trips/?cursor=garbage')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_invalid_values_is_not_found(self):
+        """Test: a well-formed cursor whose values do not fit the ordering fields is rejected"""
+        for values in (["abc", "1"], ["2026-01-01", "x"], [None, 1], [{"a": 1}, 1]):
+            cursor = base64.b64encode(urlencode({'p': json.dumps(values)}).encode()).decode()
+
+            response = self.client.get('/api/trips/', {'pagination': 'cursor', 'cursor': cursor})
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, values)
+
+    def test_cursor_page_size_is_capped(self):
+        """Test: client page size cannot exceed the server cap"""
+        with patch('core.pagination.KeysetPagination.max_page_size', 3):
+            response = self.client.get('/api/trips/?pagination=cursor&page_size=1000')
+
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_page_number_pagination_is_default(self):
+        """Test: without opting in, trips use page-number pagination"""
+        response = self.client.get('/api/trips/')
+
+        self.assertEqual(response.data['count'], 5)
+
+
 class TripWithoutAuthTestCase(APITestCase):
     """Tests without authentication"""
 
@@ -215,4 +338,521 @@ class TripWithoutAuthTestCase(APITestCase):
         self.assertIn(
             response.status_code,
             [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
-        )
\ No newline at end of file
+        )
+
+
+class TripItineraryTestCase(APITestCase):
+    """Tests for the trip itinerary endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            email='testemail@gmail.com',
+        )
+
+        self.other_user = User.objects.create_user(
+            username='otheruser',
+            password='testpass123',
+            email='othertestemail@gmail.com',
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        stops = [
+            ("Kyiv", "Ukraine", 50.4501, 30.5234),
+            ("Kyiv", "Ukraine", 50.4501, 30.5234),
+            ("Kyiv Center", "Ukraine", 50.4512, 30.5239),
+            ("Lviv", "Ukraine", 49.8397, 24.0297),
+        ]
+        for day, (city, country, lat, lon) in enumerate(stops):
+            TripPoint.objects.create(
+                trip=self.trip,
+                city=city,
+                country=country,
+                date=date.today() + timedelta(days=day),
+                planned_budget=Decimal("100.00"),
+                latitude=lat,
+                longitude=lon
+            )
+
+        self.client.force_authenticate(user=self.user)
+
+    @patch('integrations.services.currency.CurrencyService._fetch_rates')
+    @patch('integrations.services.places.PlacesService._fetch_places')
+    @patch('integrations.services.weather.WeatherService._fetch_weather')
+    def test_itinerary_deduplicates_upstream_calls(self, mock_weather, mock_places, mock_rates):
+        """Test: itinerary fetches once per distinct location"""
+        mock_weather.return_value = {'погода': 'Clear'}
+        mock_places.return_value = [{'назва': 'Golden Gate'}]
+        mock_rates.return_value = {'UAH': 40.0}
+
+        response = self.client.get(f'/api/trips/{self.trip.id}/itinerary/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['trip']['title'], 'Test Trip')
+        self.assertEqual(len(response.data['points']), 4)
+
+        first_point = response.data['points'][0]
+        self.assertEqual(first_point['weather'], {'погода': 'Clear'})
+        self.assertEqual(first_point['places_nearby'], [{'назва': 'Golden Gate'}])
+        self.assertEqual(first_point['local_budget'], '4000.0 UAH')
+
+        # Kyiv and Kyiv Center share a weather cell; places are per exact location
+        self.assertEqual(mock_weather.call_count, 2)
+        self.assertEqual(mock_places.call_count, 3)
+        mock_rates.assert_called_once()
+
+    def test_other_user_cannot_get_itinerary(self):
+        """Test: another user cannot read someone else's itinerary"""
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.client.get(f'/api/trips/{self.trip.id}/itinerary/')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TripExportTestCase(APITestCase):
+    """Tests for streaming trip exports"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            email='testemail@gmail.com',
+        )
+
+        self.other_user = User.objects.create_user(
+            username='otheruser',
+            password='testpass123',
+            email='othertestemail@gmail.com',
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        for day, city in enumerate(["Kyiv", "Lviv", "Київ"]):
+            TripPoint.objects.create(
+                trip=self.trip,
+                city=city,
+                country="Ukraine",
+                date=date.today() + timedelta(days=day),
+                planned_budget=Decimal("100.00"),
+                latitude=50.45,
+                longitude=30.52
+            )
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_export_csv(self):
+        """Test: CSV export streams a header and one row per point"""
+        response = self.client.get(f'/api/trips/{self.trip.id}/export/csv/', HTTP_ACCEPT='text/csv')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row['city'] for row in rows], ["Kyiv", "Lviv", "Київ"])
+        self.assertEqual(rows[0]['trip_title'], 'Test Trip')
+        self.assertEqual(rows[0]['planned_budget'], '100.00')
+
+    def test_export_ndjson(self):
+        """Test: NDJSON export starts with the trip followed by its points"""
+        response = self.client.get(f'/api/trips/{self.trip.id}/export/ndjson/')
+
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(lines[0]['type'], 'trip')
+        self.assertEqual(lines[0]['title'], 'Test Trip')
+        self.assertEqual([line['city'] for line in lines[1:]], ["Kyiv", "Lviv", "Київ"])
+
+    def test_other_user_cannot_export(self):
+        """Test: another user cannot export someone else's trip"""
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.client.get(f'/api/trips/{self.trip.id}/export/csv/', HTTP_ACCEPT='text/csv')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_export_ignores_format_override(self):
+        """Test: ?format=csv does not change what an export streams"""
+        response = self.client.get(f'/api/trips/{self.trip.id}/export/ndjson/?format=csv')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+
+    async def test_export_streams_async_under_asgi(self):
+        """Test: under ASGI the export is an async stream, so it is not buffered before sending"""
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.user).access_token))()
+
+        with self.settings(EXPORT_CHUNK_SIZE=2):
+            response = await self.async_client.get(
+                f'/api/trips/{self.trip.id}/export/csv/',
+                headers={'Authorization': f'Bearer {token}'},
+            )
+            chunks = [chunk async for chunk in response.streaming_content]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode())))
+        self.assertEqual([row['city'] for row in rows], ["Kyiv", "Lviv", "Київ"])
+        self.assertEqual(len(chunks), 2)
+
+
+class TripBudgetTestCase(APITestCase):
+    """Tests for server-side trip budget aggregation"""
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        stops = [
+            ("Kyiv", "Ukraine", 0, "100.00"),
+            ("Lviv", "Ukraine", 1, "50.50"),
+            ("Warsaw", "Poland", 1, "20.00"),
+            ("Atlantis", "Atlantis", 2, "5.00"),
+        ]
+        for city, country, day, budget in stops:
+            TripPoint.objects.create(
+                trip=self.trip,
+                city=city,
+                country=country,
+                date=date.today() + timedelta(days=day),
+                planned_budget=Decimal(budget),
+            )
+
+        self.client.force_authenticate(user=self.user)
+
+    @patch('integrations.services.currency.CurrencyService.get_rates')
+    def test_budget_totals(self, mock_rates):
+        """Test: totals are grouped per country, currency and day"""
+        mock_rates.return_value = {'UAH': 40.0, 'PLN': 4.0}
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/trips/{self.trip.id}/budget/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], '175.50')
+        self.assertEqual(response.data['points'], 4)
+        mock_rates.assert_called_once()
+
+        by_country = {row['country']: row['total'] for row in response.data['by_country']}
+        self.assertEqual(by_country, {'Atlantis': '5.00', 'Poland': '20.00', 'Ukraine': '150.50'})
+
+        by_currency = {row['currency']: row for row in response.data['by_currency']}
+        self.assertEqual(by_currency['UAH']['local_total'], '6020.00')
+        self.assertEqual(by_currency['PLN']['local_total'], '80.00')
+        self.assertIsNone(by_currency[None]['local_total'])
+
+        by_day = [row['total'] for row in response.data['by_day']]
+        self.assertEqual(by_day, ['100.00', '70.50', '5.00'])
+
+    def test_empty_trip_budget(self):
+        """Test: a trip without points has zero totals"""
+        self.trip.points.all().delete()
+
+        response = self.client.get(f'/api/trips/{self.trip.id}/budget/')
+
+        self.assertEqual(response.data['total'], '0.00')
+        self.assertEqual(response.data['by_currency'], [])
+
+
+@override_settings(RESPONSE_CACHE_TTL=60)
+class TripResponseCacheTestCase(APITestCase):
+    """Tests for per-user response caching of trips and points"""
+
+    def setUp(self):
+        cache.clear()
+
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            email='testemail@gmail.com',
+        )
+
+        self.other_user = User.objects.create_user(
+            username='otheruser',
+            password='testpass123',
+            email='othertestemail@gmail.com',
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_is_served_from_cache_until_a_trip_changes(self):
+        """Test: repeated reads only run the ETag query and a write shows up on the next read"""
+        self.client.get('/api/trips/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/trips/')
+        self.assertEqual(response.data['results'][0]['title'], "Test Trip")
+
+        self.client.patch(f'/api/trips/{self.trip.id}/', {'title': "Renamed"}, format='json')
+
+        response = self.client.get('/api/trips/')
+        self.assertEqual(response.data['results'][0]['title'], "Renamed")
+
+    def test_cache_is_per_user(self):
+        """Test: a cached list is never served to another user"""
+        self.client.get('/api/trips/')
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get('/api/trips/')
+
+        self.assertEqual(response.data['results'], [])
+
+    @patch('integrations.services.currency.CurrencyService.get_rates', return_value={'UAH': 40.0})
+    def test_bulk_created_points_invalidate_point_list(self, mock_rates):
+        """Test: bulk inserts, which send no signals, still drop cached point lists"""
+        url = f'/api/trips/{self.trip.id}/points/'
+        self.client.get(url)
+
+        self.client.post(f'{url}bulk/', [{
+            'city': "Kyiv",
+            'country': "Ukraine",
+            'date': str(date.today()),
+            'planned_budget': '10.00',
+        }], format='json')
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['count'], 1)
+
+    @patch('integrations.services.currency.http_client.get')
+    def test_point_cache_follows_rate_table(self, mock_get):
+        """Test: refetched exchange rates are not hidden behind a cached point list"""
+        Trip.objects.filter(pk=self.trip.pk).update(base_currency='USD')
+        TripPoint.objects.create(
+            trip=self.trip,
+            city="Kyiv",
+            country="Ukraine",
+            date=date.today(),
+            planned_budget=Decimal("10.00"),
+        )
+        url = f'/api/trips/{self.trip.id}/points/'
+
+        mock_get.return_value.json.return_value = {'rates': {'USD': 1.0, 'UAH': 40.0}}
+        CurrencyService().refresh_rates()
+        self.assertEqual(self.client.get(url).data['results'][0]['local_budget'], "400.0 UAH")
+
+        mock_get.return_value.json.return_value = {'rates': {'USD': 1.0, 'UAH': 50.0}}
+        with patch('integrations.services.cache.time.time', return_value=time.time() + 1):
+            CurrencyService().refresh_rates()
+        clear_local_cache()
+
+        self.assertEqual(self.client.get(url).data['results'][0]['local_budget'], "500.0 UAH")
+
+
+class TripConditionalGetTestCase(APITestCase):
+    """Tests for ETag / Last-Modified validation of trips and points"""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        clear_local_cache()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            email='testemail@gmail.com',
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        self.point = TripPoint.objects.create(
+            trip=self.trip,
+            city="Kyiv",
+            country="Ukraine",
+            date=date.today(),
+            planned_budget=Decimal("100.00"),
+        )
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_matching_etag_returns_not_modified(self):
+        """Test: If-None-Match with the current ETag gets 304 without a body"""
+        url = f'/api/trips/{self.trip.id}/'
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        self.assertFalse(etag.startswith('W/'))
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_etag_changes_when_list_changes(self):
+        """Test: updating a trip gives the list a new ETag"""
+        etag = self.client.get('/api/trips/')['ETag']
+
+        self.client.patch(f'/api/trips/{self.trip.id}/', {'title': "Renamed"}, format='json')
+
+        response = self.client.get('/api/trips/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @patch('integrations.services.currency.CurrencyService.get_rates', return_value={'UAH': 40.0})
+    def test_point_list_etag_follows_deletes(self, mock_rates):
+        """Test: point lists get weak ETags that change when a point is deleted"""
+        url = f'/api/trips/{self.trip.id}/points/'
+        etag = self.client.get(url)['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.delete(f'{url}{self.point.id}/')
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_list_has_no_last_modified(self):
+        """Test: lists send no Last-Modified, so a delete cannot be hidden behind If-Modified-Since"""
+        response = self.client.get('/api/trips/')
+        self.assertNotIn('Last-Modified', response)
+
+        modified_since = self.client.get(f'/api/trips/{self.trip.id}/')['Last-Modified']
+        self.client.delete(f'/api/trips/{self.trip.id}/')
+
+        response = self.client.get('/api/trips/', HTTP_IF_MODIFIED_SINCE=modified_since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+
+    @patch('integrations.services.currency.http_client.get')
+    def test_point_etag_follows_rate_table(self, mock_get):
+        """Test: refetched exchange rates give point lists and details a new ETag"""
+        mock_get.return_value.json.return_value = {'rates': {'USD': 1.0, 'UAH': 40.0}}
+        CurrencyService().refresh_rates()
+
+        for url in (f'/api/trips/{self.trip.id}/points/', f'/api/trips/{self.trip.id}/points/{self.point.id}/'):
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+            with patch('integrations.services.cache.time.time', return_value=time.time() + 1):
+                CurrencyService().refresh_rates()
+            # As seen by a worker whose in-process copy has expired
+            clear_local_cache()
+
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+
+class SparseFieldsetTestCase(APITestCase):
+    """Tests for ?fields= / ?omit= on trips and points"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            email='testemail@gmail.com',
+        )
+
+        self.trip = Trip.objects.create(
+            user=self.user,
+            title="Test Trip",
+            description="Long description",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+        self.point = TripPoint.objects.create(
+            trip=self.trip,
+            city="Kyiv",
+            country="Ukraine",
+            date=date.today(),
+            planned_budget=Decimal("100.00"),
+            latitude=50.45,
+            longitude=30.52,
+        )
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_omit_drops_trip_fields(self):
+        """Test: ?omit=description leaves the field out of list and detail"""
+        response = self.client.get('/api/trips/?omit=description')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('description', response.data['results'][0])
+        self.assertEqual(response.data['results'][0]['title'], "Test Trip")
+
+        response = self.client.get(f'/api/trips/{self.trip.id}/?omit=description')
+        self.assertNotIn('description', response.data)
+
+    def test_fields_limits_trip_fields(self):
+        """Test: ?fields= returns only the listed fields and ignores unknown names"""
+        response = self.client.get('/api/trips/?fields=id,title,unknown')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+
+    @patch('integrations.services.currency.CurrencyService.get_rates')
+    def test_point_fields_skip_currency(self, mock_rates):
+        """Test: points listed without local_budget do not look up exchange rates"""
+        # No deferred column is loaded lazily per row
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/trips/{self.trip.id}/points/?fields=id,latitude,longitude')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0], {'id': self.point.id, 'latitude': 50.45, 'longitude': 30.52})
+        mock_rates.assert_not_called()
+
+    @patch('integrations.services.currency.CurrencyService.get_rates', return_value={'UAH': 40.0})
+    def test_point_local_budget_still_selectable(self, mock_rates):
+        """Test: selecting local_budget loads the columns it needs"""
+        # No deferred column is loaded lazily per row
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/trips/{self.trip.id}/points/?fields=id,local_budget')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'local_budget'})
+        self.assertIsNotNone(response.data['results'][0]['local_budget'])
+
+    def test_writes_keep_every_field(self):
+        """Test: ?fields= does not change the fields accepted or returned on writes"""
+        response = self.client.patch(
+            f'/api/trips/{self.trip.id}/?fields=id', {'title': "Renamed"}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], "Renamed")
@@ -1,14 +1,33 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from core.caching import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.fieldsets import SparseFieldsetViewMixin
+from core.pagination import OptionalCursorPaginationMixin, TripCursorPagination
 from core.permissions import IsOwnerPermission
+from route_points.itinerary import build_itinerary
+from trips.budget import build_budget
+from trips.export import EXPORT_FORMATS, ExportContentNegotiation, aiterate
 from trips.models import Trip
 from trips.serializers import TripSerializer
 
 
-class TripsViewSet(viewsets.ModelViewSet):
+class TripsViewSet(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SparseFieldsetViewMixin,
+    OptionalCursorPaginationMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = TripSerializer
+    cursor_pagination_class = TripCursorPagination
     permission_classes = [IsAuthenticated, IsOwnerPermission]
     queryset = Trip.objects.all()
+    sparse_required_fields = ('id', 'start_date')
 
     def get_queryset(self):
 
@@ -18,7 +37,43 @@ class TripsViewSet(viewsets.ModelViewSet):
         if not self.request.user.is_authenticated:
             return Trip.objects.none()
 
-        return Trip.objects.filter(user=self.request.user)
+        return Trip.objects.filter(user=self.request.user).order_by('start_date', 'id')
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        serializer.save(user=self.request.user)
+
+    @action(detail=True, methods=["get"])
+    def itinerary(self, request, pk=None):
+        trip = self.get_object()
+
+        return Response({
+            "trip": self.get_serializer(trip).data,
+            "points": build_itinerary(trip),
+        })
+
+    @action(detail=True, methods=["get"])
+    def budget(self, request, pk=None):
+        trip = self.get_object()
+
+        return Response(build_budget(trip))
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path=r"export/(?P<export_format>csv|ndjson)",
+        content_negotiation_class=ExportContentNegotiation,
+    )
+    def export(self, request, pk=None, export_format=None):
+        """
+        Streams the trip and its points as CSV or NDJSON without loading them all in memory
+        """
+        trip = self.get_object()
+        stream, content_type = EXPORT_FORMATS[export_format]
+
+        content = stream(trip)
+        if isinstance(request._request, ASGIRequest):
+            content = aiterate(content)
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="trip-{trip.id}.{export_format}"'
+        return response